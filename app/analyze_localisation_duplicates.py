@@ -11,14 +11,32 @@ Victoria 2 loads localisation files in reverse lexicographic order (Z→A, 9→0
 Later files override earlier ones for matching keys.
 """
 
-import csv
+import io
 import os
 import sys
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
 
+@dataclass
+class FileRows:
+    """Parsed rows of one CSV file, stored column-wise (one list per field)."""
+    keys: List[str] = field(default_factory=list)
+    english: List[str] = field(default_factory=list)
+    line_nums: 'array[int]' = field(default_factory=lambda: array('i'))
+    col_counts: 'array[int]' = field(default_factory=lambda: array('I'))
+    # Row index -> raw column 14 of the rows whose end marker is not 'x'
+    bad_end_markers: Dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
 class LocalisationAnalyser:
     """Analyzes Victoria 2 localisation CSV files for duplicates and issues."""
 
@@ -32,30 +50,36 @@ class LocalisationAnalyser:
             localisation_path: Path to the localisation folder
         """
         self.localisation_path = Path(localisation_path)
-        self.file_data: Dict[str, List[Tuple[str, List[str], int]]] = {}
+        self.file_data: Dict[str, FileRows] = {}
         # Keys to files mapping: key -> list of (filename, line_number, english_text)
-        self.key_to_files: Dict[str, List[Tuple[str, int, str]]] = defaultdict(list)
+        self.key_to_files: Dict[str, List[Tuple[str, int, str]]] = {}
 
-    def load_file(self, filepath: Path) -> List[Tuple[str, List[str], int]]:
+    @staticmethod
+    def load_file(filepath: Path) -> FileRows:
         """Load a CSV file and return parsed data.
 
         Args:
             filepath: Path to the CSV file
 
         Returns:
-            List of tuples: (key, columns, line_number)
+            FileRows with keys, english text, line numbers, column counts and
+            any bad end markers
         """
-        data = []
+        data = FileRows()
         try:
+            # Vic2 localisation has no quoting or escapes, so ';' is a plain
+            # delimiter and str.split is enough (and much cheaper than csv)
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                reader = csv.reader(f, delimiter=';')
-                for line_num, row in enumerate(reader, start=1):
-                    if not row:  # Skip empty rows
-                        continue
-                    if len(row) >= 1:
-                        key = row[0].strip()
-                        if key:  # Only process rows with a key
-                            data.append((key, row, line_num))
+                for line_num, line in enumerate(f, start=1):
+                    row = line.rstrip('\r\n').split(';')
+                    key = row[0].strip()
+                    if key:  # Only process rows with a key
+                        if len(row) >= 14 and row[13].strip() != 'x':
+                            data.bad_end_markers[len(data.keys)] = row[13]
+                        data.keys.append(key)
+                        data.english.append(row[1] if len(row) > 1 else "")
+                        data.line_nums.append(line_num)
+                        data.col_counts.append(len(row))
         except Exception as e:
             print(f"  Error reading {filepath.name}: {e}", file=sys.stderr)
 
@@ -63,19 +87,38 @@ class LocalisationAnalyser:
 
     def analyze_all_files(self) -> None:
         """Load and analyze all CSV files in the localisation folder."""
-        csv_files = sorted(self.localisation_path.glob('*.csv'), reverse=True)
+        with os.scandir(self.localisation_path) as entries:
+            csv_files = sorted(
+                (Path(entry.path) for entry in entries
+                 if entry.name.lower().endswith('.csv') and entry.is_file()),
+                reverse=True
+            )
         print(f"Found {len(csv_files)} CSV files\n")
 
-        for filepath in csv_files:
-            print(f"Loading: {filepath.name} ", end='', flush=True)
-            data = self.load_file(filepath)
-            self.file_data[filepath.name] = data
-            print(f"({len(data)} keys)", flush=True)
-
-            # Build cross-file index
-            for key, columns, line_num in data:
-                english_text = columns[1] if len(columns) > 1 else ""
-                self.key_to_files[key].append((filepath.name, line_num, english_text))
+        # Files parse independently, so load them across processes and only
+        # merge the results here, in load order
+        key_to_files = self.key_to_files
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(self.load_file, csv_files, chunksize=4)
+
+            for filepath, data in zip(csv_files, results):
+                # Shared here rather than in the workers, whose objects arrive as
+                # fresh copies: the same key recurs across files and in every index
+                data.keys[:] = map(sys.intern, data.keys)
+                self.file_data[filepath.name] = data
+                print(f"Loading: {filepath.name} ({len(data)} keys)", flush=True)
+
+                # Build cross-file index
+                # Plain dict + get(): most keys are new, so skip defaultdict's
+                # __missing__ dispatch and create each list with its first entry
+                filename = filepath.name
+                for key, line_num, english_text in zip(data.keys, data.line_nums, data.english):
+                    entry = (filename, line_num, english_text)
+                    entries = key_to_files.get(key)
+                    if entries is None:
+                        key_to_files[key] = [entry]
+                    else:
+                        entries.append(entry)
 
     def find_intra_file_duplicates(self) -> Dict[str, List[Tuple[str, int, int, str, str]]]:
         """Find duplicate keys within each individual file.
@@ -86,19 +129,16 @@ class LocalisationAnalyser:
         intra_file_dupes: Dict[str, List[Tuple[str, int, int, str, str]]] = {}
 
         for filename, data in self.file_data.items():
-            key_positions: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
-
-            for key, columns, line_num in data:
-                english_text = columns[1] if len(columns) > 1 else ""
-                key_positions[key].append((line_num, english_text))
-
-            # Find keys with multiple occurrences
+            # key -> (line_number, english_text) of its first occurrence
+            seen: Dict[str, Tuple[int, str]] = {}
             dupes = []
-            for key, positions in key_positions.items():
-                if len(positions) > 1:
-                    first_line, first_text = positions[0]
-                    for dup_line, dup_text in positions[1:]:
-                        dupes.append((key, first_line, dup_line, first_text, dup_text))
+
+            for key, line_num, english_text in zip(data.keys, data.line_nums, data.english):
+                first = seen.get(key)
+                if first is None:
+                    seen[key] = (line_num, english_text)
+                else:
+                    dupes.append((key, first[0], line_num, first[1], english_text))
 
             if dupes:
                 intra_file_dupes[filename] = sorted(dupes, key=lambda x: x[0])
@@ -139,29 +179,24 @@ class LocalisationAnalyser:
         issues: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
 
         for filename, data in self.file_data.items():
-            for key, columns, line_num in data:
+            # load_file only keeps rows with a non-empty key, so only the
+            # column count and end marker can be wrong here
+            bad_end_markers = data.bad_end_markers
+            for idx, (num_columns, line_num) in enumerate(zip(data.col_counts, data.line_nums)):
                 # Check column count
-                if len(columns) != self.EXPECTED_COLUMNS:
+                if num_columns != self.EXPECTED_COLUMNS:
                     issues[filename].append((
                         line_num,
                         'column_mismatch',
-                        f'Expected {self.EXPECTED_COLUMNS} columns, got {len(columns)}'
-                    ))
-
-                # Check for empty key
-                if not key.strip():
-                    issues[filename].append((
-                        line_num,
-                        'empty_key',
-                        'Key is empty or whitespace only'
+                        f'Expected {self.EXPECTED_COLUMNS} columns, got {num_columns}'
                     ))
 
                 # Check for missing end marker (column 14 should be 'x')
-                if len(columns) >= 14 and columns[13].strip() != 'x':
+                if idx in bad_end_markers:
                     issues[filename].append((
                         line_num,
                         'missing_end_marker',
-                        f'End marker should be "x", got "{columns[13]}"'
+                        f'End marker should be "x", got "{bad_end_markers[idx]}"'
                     ))
 
         return dict(issues)
@@ -347,22 +382,29 @@ def main():
 
     analyser = LocalisationAnalyser(args.path)
     analyser.analyze_all_files()
-    analyser.print_summary()
 
-    # Show requested sections or all if none specified
-    show_all = not (args.intra or args.inter or args.format or args.order)
+    # Build the whole report in memory and write it once: thousands of
+    # individual print() calls are slow on the Windows console
+    report = io.StringIO()
+    with redirect_stdout(report):
+        analyser.print_summary()
+
+        # Show requested sections or all if none specified
+        show_all = not (args.intra or args.inter or args.format or args.order)
+
+        if show_all or args.intra:
+            print_intra_file_duplicates(analyser)
 
-    if show_all or args.intra:
-        print_intra_file_duplicates(analyser)
+        if show_all or args.inter:
+            print_inter_file_duplicates(analyser, limit=args.limit)
 
-    if show_all or args.inter:
-        print_inter_file_duplicates(analyser, limit=args.limit)
+        if show_all or args.format:
+            print_format_issues(analyser)
 
-    if show_all or args.format:
-        print_format_issues(analyser)
+        if show_all or args.order:
+            print_load_order(analyser)
 
-    if show_all or args.order:
-        print_load_order(analyser)
+    sys.stdout.write(report.getvalue())
 
 
 if __name__ == '__main__':
@@ -19,28 +19,38 @@ def bulk_remove_keys(filepath: Path, keys_to_remove: set) -> int:
     Returns:
         Number of keys removed
     """
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        lines = f.readlines()
+    # Work on raw bytes: only the key column is inspected, so there is no need
+    # to decode the file (and untouched lines are written back byte-for-byte)
+    raw = filepath.read_bytes()
+    keys_b = {key.encode('utf-8') for key in keys_to_remove}
 
     removed_count = 0
     new_lines = []
 
-    for line in lines:
-        # Check if this line contains a key to remove
-        should_remove = False
-        line_key = line.split(';')[0].strip() if line and ';' in line else ''
-
-        if line_key and line_key in keys_to_remove:
-            should_remove = True
+    for line in raw.splitlines(keepends=True):
+        head, sep, _ = line.partition(b';')
+        if not sep:
+            line_key = b''
+            remove = False
+        elif head.isascii():
+            line_key = head.strip()
+            remove = line_key in keys_b
+        else:
+            # Non-ASCII keys are compared decoded, as the reports that list
+            # them decode: an invalid byte turns into U+FFFD on both sides
+            key = head.decode('utf-8', errors='replace').strip()
+            line_key = key.encode('utf-8')
+            remove = key in keys_to_remove
+
+        if line_key and remove:
             removed_count += 1
-            # Add comment instead of deleting
-            new_lines.append(f"# {line_key} removed - overridden by higher priority file\n")
-
-        if not should_remove:
+            # Add comment instead of deleting, keeping the line's own ending
+            ending = line[len(line.rstrip(b'\r\n')):] or b'\n'
+            new_lines.append(b'# ' + line_key + b' removed - overridden by higher priority file' + ending)
+        else:
             new_lines.append(line)
 
-    with open(filepath, 'w', encoding='utf-8', errors='replace') as f:
-        f.writelines(new_lines)
+    filepath.write_bytes(b''.join(new_lines))
 
     return removed_count
 
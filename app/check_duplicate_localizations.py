@@ -9,76 +9,205 @@ Later files override earlier ones for matching keys.
 
 import os
 import sys
+import pickle
 import argparse
+import heapq
+from array import array
 from collections import defaultdict
 
+from localisation_utils import map_files_in_parallel
+
+# Bytes that str.strip() treats as whitespace once decoded as Windows-1252
+# (ASCII whitespace plus 0xA0, the no-break space)
+KEY_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\xa0'
+
 def parse_csv_keys(filepath):
     """
     Parse a CSV file and extract all localisation keys.
-    """
-    keys = defaultdict(list)
-
-    try:
-        # Use Windows-1252 encoding standard for Vic2
-        with open(filepath, 'r', encoding='windows-1252', errors='replace') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
 
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
+    Works on the raw bytes: only the key field is looked at, and each
+    distinct key is decoded once at the end instead of decoding every line.
 
-                # Extract key (first semicolon-separated field)
-                if ';' in line:
-                    key = line.split(';', 1)[0].strip()
+    Maps each key to its line number, or to a list of line numbers once the
+    key repeats - nearly every key is unique, so most entries need no list.
+    Returns None if the file could not be read or parsed.
+    """
+    keys = {}
+    # Bound once: the loop below runs for every line of the file
+    get = keys.get
+    whitespace = KEY_WHITESPACE
 
-                    # Skip empty keys
-                    if key:
-                        keys[key].append(line_num)
+    try:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+
+        # bytes.splitlines() breaks on \r, \n and \r\n exactly like text-mode
+        # iteration, so line numbers stay the same for CRCRLF files
+        for line_num, line in enumerate(raw.splitlines(), 1):
+            # Blank lines and '#' comments are rejected by their first byte
+            if not line or line[0] == 0x23:
+                continue
+
+            # Extract key (first semicolon-separated field)
+            key, sep, _ = line.partition(b';')
+            if not sep:
+                continue
+
+            # Skip empty keys and comments
+            key = key.strip(whitespace)
+            if key and key[0] != 0x23:
+                prev = get(key)
+                if prev is None:
+                    keys[key] = line_num
+                elif isinstance(prev, int):
+                    keys[key] = [prev, line_num]
+                else:
+                    prev.append(line_num)
 
-        return dict(keys)
+        # Use Windows-1252 encoding standard for Vic2
+        decoded = {}
+        for key, line_numbers in keys.items():
+            # Interned so the same key from different files shares one object
+            key = sys.intern(key.decode('windows-1252', errors='replace'))
+            prev = decoded.get(key)
+            if prev is not None:
+                # Distinct undefined bytes all decode to U+FFFD
+                if isinstance(prev, int):
+                    prev = [prev]
+                if isinstance(line_numbers, int):
+                    line_numbers = [line_numbers]
+                decoded[key] = sorted(prev + line_numbers)
+            else:
+                decoded[key] = line_numbers
+
+        return decoded
 
     except Exception as e:
         sys.stderr.write(f"Error parsing {filepath}: {e}\n")
-        return {}
+        return None
 
-def check_duplicates_in_file(filepath):
+def find_duplicates_in_keys(keys):
     """
-    Check for duplicate keys within a single file.
+    Return the keys of a single parsed file that appear more than once.
     """
-    keys = parse_csv_keys(filepath)
     duplicates = []
 
     for key, line_numbers in keys.items():
-        if len(line_numbers) > 1:
+        # Single occurrences are stored as a bare line number
+        if isinstance(line_numbers, list):
             duplicates.append((key, len(line_numbers), line_numbers))
 
     return sorted(duplicates, key=lambda x: x[1], reverse=True)
 
-def check_duplicates_across_files(directory):
+# An occurrence (file, line) is packed into one int: the file's index in
+# load order above the line number's bits
+LINE_BITS = 32
+LINE_MASK = (1 << LINE_BITS) - 1
+
+# Parsed keys of unchanged files are reused between runs from this file,
+# stored in the localisation directory itself (the game only reads *.csv)
+CACHE_FILENAME = '.localisation_cache.pickle'
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler for plain containers only - the cache never holds objects."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Unexpected object in cache: {module}.{name}")
+
+def load_cache(cache_path):
     """
-    Check for duplicate keys across all CSV files.
+    Load the parse cache: {filename: (mtime_ns, size, keys)}. Empty if unusable.
     """
-    csv_files = sorted([f for f in os.listdir(directory) if f.endswith('.csv')], reverse=True)
-    all_keys = defaultdict(list)
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = _DataUnpickler(f).load()
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        return {}
 
-    for filename in csv_files:
-        filepath = os.path.join(directory, filename)
-        keys = parse_csv_keys(filepath)
+def save_cache(cache_path, cache):
+    """
+    Write the parse cache atomically; failure to write is not an error.
+    """
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        sys.stderr.write(f"Warning: could not write cache {cache_path}: {e}\n")
 
-        for key, line_numbers in keys.items():
-            for line_num in line_numbers:
-                all_keys[key].append((filename, line_num))
+def scan_all(directory, use_cache=True):
+    """
+    Parse every CSV file in the directory exactly once.
 
-    # Filter to only duplicates
-    duplicates = {k: v for k, v in all_keys.items() if len(v) > 1}
+    Files whose modification time and size match the cache are not parsed
+    again. Returns (file_keys, all_keys): file_keys maps each filename (in
+    load order) to its parsed keys, all_keys maps each key to an array of
+    every occurrence across all files, packed as
+    (file_index << LINE_BITS) | line_num with file_index into file_keys.
+    """
+    with os.scandir(directory) as entries:
+        csv_entries = sorted((e for e in entries if e.name.endswith('.csv') and e.is_file()),
+                             key=lambda e: e.name, reverse=True)
+        csv_files = [e.name for e in csv_entries]
+        signatures = {}
+        for e in csv_entries:
+            st = e.stat()
+            signatures[e.name] = (st.st_mtime_ns, st.st_size)
+
+    cache_path = os.path.join(directory, CACHE_FILENAME)
+    cache = load_cache(cache_path) if use_cache else {}
+    parsed = {}
+    for filename in csv_files:
+        cached = cache.get(filename)
+        # Anything but a (mtime_ns, size, keys) tuple is stale, whatever wrote it
+        if (isinstance(cached, tuple) and len(cached) == 3
+                and cached[:2] == signatures[filename] and isinstance(cached[2], dict)):
+            parsed[filename] = cached[2]
+
+    # Only the files that changed since the last run are parsed again
+    stale = [filename for filename in csv_files if filename not in parsed]
+    filepaths = [os.path.join(directory, filename) for filename in stale]
+    parsed.update(zip(stale, map_files_in_parallel(parse_csv_keys, filepaths)))
+
+    # Files that failed to parse (locked, unreadable...) are left out of the
+    # cache, so the next run tries them again
+    if use_cache and (stale or len(cache) != len(csv_files)):
+        save_cache(cache_path, {filename: signatures[filename] + (parsed[filename],)
+                                for filename in csv_files if parsed[filename] is not None})
+
+    file_keys = {}
+    all_keys = {}
+
+    for file_index, filename in enumerate(csv_files):
+        keys = parsed[filename]
+        if keys is None:
+            keys = {}
+        file_keys[filename] = keys
+        file_bits = file_index << LINE_BITS
 
-    return duplicates
+        for key, line_numbers in keys.items():
+            # Re-intern: keys unpickled from a worker or the cache are fresh objects
+            key = sys.intern(key)
+            if isinstance(line_numbers, int):
+                packed = (file_bits | line_numbers,)
+            else:
+                packed = [file_bits | line_num for line_num in line_numbers]
+            locations = all_keys.get(key)
+            if locations is None:
+                all_keys[key] = array('q', packed)
+            else:
+                locations.extend(packed)
+
+    return file_keys, all_keys
 
 def main():
     """Main entry point for the duplicate checker."""
     parser = argparse.ArgumentParser(description="Check for duplicate localisation keys in Victoria 2 mod.")
     parser.add_argument("directory", nargs="?", help="Path to localisation directory (default: detects relative path)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-parse every file and do not read or write {CACHE_FILENAME}")
     args = parser.parse_args()
 
     # Determine directory
@@ -103,89 +232,94 @@ def main():
     sys.stdout.write("=" * 70 + "\n")
     sys.stdout.write(f"Scanning directory: {localisation_dir}\n\n")
 
-    csv_files = sorted([f for f in os.listdir(localisation_dir) if f.endswith('.csv')], reverse=True)
+    # Single pass over the corpus; both checks below are derived from it
+    file_keys, all_keys = scan_all(localisation_dir, use_cache=not args.no_cache)
 
-    if not csv_files:
+    if not file_keys:
         sys.stderr.write(f"Error: No CSV files found in {localisation_dir}\n")
         return 1
 
-    sys.stdout.write("[1/2] Checking for duplicates WITHIN individual files...\n\n")
+    # Collect the report and write it in one go at the end
+    report = []
+    emit = report.append
+
+    emit("[1/2] Checking for duplicates WITHIN individual files...\n\n")
 
     # Check for duplicates within each file
     has_intra_file_duplicates = False
     
-    for filename in csv_files:
-        filepath = os.path.join(localisation_dir, filename)
-        duplicates = check_duplicates_in_file(filepath)
+    for filename, keys in file_keys.items():
+        duplicates = find_duplicates_in_keys(keys)
 
         if duplicates:
             has_intra_file_duplicates = True
-            sys.stdout.write(f"File: {filename}\n")
+            emit(f"File: {filename}\n")
 
             for key, count, line_numbers in duplicates[:10]:  # Show first 10
-                sys.stdout.write(f"  - '{key}' appears {count} times at lines: {line_numbers}\n")
+                emit(f"  - '{key}' appears {count} times at lines: {line_numbers}\n")
 
             if len(duplicates) > 10:
-                sys.stdout.write(f"  ... and {len(duplicates) - 10} more duplicates\n")
+                emit(f"  ... and {len(duplicates) - 10} more duplicates\n")
 
-            sys.stdout.write("\n")
+            emit("\n")
 
     if not has_intra_file_duplicates:
-        sys.stdout.write("No duplicates found within individual files.\n\n")
+        emit("No duplicates found within individual files.\n\n")
 
-    sys.stdout.write("[2/2] Checking for duplicates ACROSS multiple files...\n\n")
+    emit("[2/2] Checking for duplicates ACROSS multiple files...\n\n")
 
     # Check for duplicates across files
-    all_duplicates = check_duplicates_across_files(localisation_dir)
+    all_duplicates = {k: v for k, v in all_keys.items() if len(v) > 1}
 
     if all_duplicates:
-        # Sort by number of occurrences
-        sorted_duplicates = sorted(all_duplicates.items(), key=lambda x: len(x[1]), reverse=True)
+        filenames = list(file_keys)
 
-        sys.stdout.write("Keys appearing in multiple files (later files override earlier):\n\n")
+        # Only the 20 most common duplicates are shown, so select them
+        # without sorting the rest (ties keep scan order, as sorted() would)
+        top_duplicates = heapq.nlargest(20, all_duplicates.items(), key=lambda x: len(x[1]))
 
-        # Show first 20 most common duplicates
-        shown = 0
-        for key, locations in sorted_duplicates:
-            if shown >= 20:
-                remaining = len(sorted_duplicates) - 20
-                sys.stdout.write(f"... and {remaining} more keys with duplicates\n")
-                break
+        emit("Keys appearing in multiple files (later files override earlier):\n\n")
 
-            sys.stdout.write(f"Key: '{key}' ({len(locations)} occurrences)\n")
+        for key, locations in top_duplicates:
+            emit(f"Key: '{key}' ({len(locations)} occurrences)\n")
 
             # Group by file
             file_locations = defaultdict(list)
-            for filename, line_num in locations:
-                file_locations[filename].append(line_num)
+            for packed in locations:
+                file_locations[filenames[packed >> LINE_BITS]].append(packed & LINE_MASK)
 
             for filename in sorted(file_locations.keys(), reverse=True):
                 lines = file_locations[filename]
                 lines_str = f"lines {lines}" if len(lines) > 1 else f"line {lines[0]}"
-                sys.stdout.write(f"  - {filename}: {lines_str}\n")
+                emit(f"  - {filename}: {lines_str}\n")
 
-            sys.stdout.write("\n")
-            shown += 1
+            emit("\n")
+
+        remaining = len(all_duplicates) - len(top_duplicates)
+        if remaining > 0:
+            emit(f"... and {remaining} more keys with duplicates\n")
 
     else:
-        sys.stdout.write("No duplicate keys found across files.\n\n")
+        emit("No duplicate keys found across files.\n\n")
 
-    sys.stdout.write("=" * 70 + "\n")
-    sys.stdout.write("Summary\n")
-    sys.stdout.write("=" * 70 + "\n\n")
+    emit("=" * 70 + "\n")
+    emit("Summary\n")
+    emit("=" * 70 + "\n\n")
 
     if has_intra_file_duplicates:
-        sys.stdout.write("[!] CRITICAL: Found duplicates WITHIN files.\n")
-        sys.stdout.write("    These can cause parsing issues and should be fixed immediately.\n")
+        emit("[!] CRITICAL: Found duplicates WITHIN files.\n")
+        emit("    These can cause parsing issues and should be fixed immediately.\n")
     else:
-        sys.stdout.write("[OK] No duplicates found within individual files.\n")
+        emit("[OK] No duplicates found within individual files.\n")
 
     if all_duplicates:
-        sys.stdout.write(f"\n[INFO] Found {len(all_duplicates)} duplicate keys ACROSS files.\n")
+        emit(f"\n[INFO] Found {len(all_duplicates)} duplicate keys ACROSS files.\n")
     else:
-        sys.stdout.write("\n[OK] No duplicate keys found across files.\n")
+        emit("\n[OK] No duplicate keys found across files.\n")
+
+    emit("\n")
 
-    sys.stdout.write("\n")
+    sys.stdout.write(''.join(report))
 
     if has_intra_file_duplicates:
         return 1  # Return error code for critical issues
@@ -54,17 +54,23 @@ import os
 import re
 import sys
 import csv
+import codecs
 from pathlib import Path
 from typing import Dict, Set, List, Tuple, Optional
 from collections import defaultdict
 import argparse
 
-# Try to import chardet for better encoding detection
+# Try to import chardet for better encoding detection.
+# Prefer faust-cchardet (C implementation, same detect() API) when installed.
 try:
-    import chardet
+    import cchardet as chardet
     HAVE_CHARDET = True
 except ImportError:
-    HAVE_CHARDET = False
+    try:
+        import chardet
+        HAVE_CHARDET = True
+    except ImportError:
+        HAVE_CHARDET = False
 
 # Configuration
 # Default paths (can remain as fallbacks, but we'll prioritize args)
@@ -83,6 +89,13 @@ LOCALISATION_DIR = None
 ENCODING = "windows-1252"
 CSV_DELIMITER = ";"
 
+# Byte order marks checked before any trial decoding
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
 # Colors for terminal output (Windows)
 class Colors:
     HEADER = "\033[95m"
@@ -96,12 +109,21 @@ class Colors:
     UNDERLINE = "\033[4m"
 
 
+def _decode_text(raw: bytes, encoding: str, errors: str = "strict") -> str:
+    """Decode bytes with the same universal-newline handling as Path.read_text()."""
+    text = raw.decode(encoding, errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def read_file_with_encoding(file_path: Path) -> Optional[str]:
     """
     Read a file with automatic encoding detection.
     Tries UTF-8 first, then detects encoding if that fails.
 
     Priority order for encoding detection:
+    0. Byte order mark (UTF-8 / UTF-16), if present
     1. UTF-8 (with BOM handling)
     2. Windows-1252 (Victoria 2 standard)
     3. UTF-16 (common on Windows)
@@ -112,47 +134,64 @@ def read_file_with_encoding(file_path: Path) -> Optional[str]:
     if not file_path.exists():
         return None
 
+    # Read once; every decoding attempt below works on the same buffer
+    try:
+        raw = file_path.read_bytes()
+    except OSError:
+        return None
+
+    # A BOM identifies the encoding outright - no trial decoding needed
+    for bom, encoding in BOM_ENCODINGS:
+        if raw.startswith(bom):
+            try:
+                return _decode_text(raw, encoding)
+            except UnicodeDecodeError:
+                break
+
     # Try UTF-8 first (with BOM handling)
     try:
-        return file_path.read_text(encoding="utf-8-sig")
-    except (UnicodeDecodeError, FileNotFoundError):
+        return _decode_text(raw, "utf-8-sig")
+    except UnicodeDecodeError:
         pass
 
     # Try Windows-1252 (Victoria 2 standard encoding)
     try:
-        return file_path.read_text(encoding="windows-1252")
-    except (UnicodeDecodeError, FileNotFoundError):
+        return _decode_text(raw, "windows-1252")
+    except UnicodeDecodeError:
         pass
 
     # Try UTF-16 LE/BE (common on Windows)
     for encoding in ["utf-16-le", "utf-16-be", "utf-16"]:
         try:
-            return file_path.read_text(encoding=encoding)
-        except (UnicodeDecodeError, FileNotFoundError):
+            return _decode_text(raw, encoding)
+        except UnicodeDecodeError:
             continue
 
     # Auto-detect encoding if chardet is available
     if HAVE_CHARDET:
         try:
-            with open(file_path, 'rb') as f:
-                raw = f.read()
-                result = chardet.detect(raw)
-                detected_encoding = result.get('encoding', 'latin-1')
-                confidence = result.get('confidence', 0)
-                # Only use detected encoding if confidence is reasonable
-                if confidence > 0.6:
-                    try:
-                        return raw.decode(detected_encoding, errors='replace')
-                    except:
-                        pass
+            # Feed in small chunks and stop as soon as the detector is sure,
+            # rather than running it over the whole file
+            detector = chardet.UniversalDetector()
+            for start in range(0, len(raw), 2048):
+                detector.feed(raw[start:start + 2048])
+                if detector.done:
+                    break
+            detector.close()
+            result = detector.result
+            detected_encoding = result.get('encoding', 'latin-1')
+            confidence = result.get('confidence', 0)
+            # Only use detected encoding if confidence is reasonable
+            if confidence > 0.6:
+                try:
+                    return _decode_text(raw, detected_encoding, 'replace')
+                except:
+                    pass
         except Exception:
             pass
 
     # Last resort - latin-1 never fails
-    try:
-        return file_path.read_text(encoding="latin-1", errors="replace")
-    except Exception:
-        return None
+    return _decode_text(raw, "latin-1", "replace")
 
 
 def parse_modifiers_file(file_path: Path, modifier_type: str) -> Set[str]:
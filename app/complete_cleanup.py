@@ -1,82 +1,92 @@
 #!/usr/bin/env python3
 """
-Complete recursive cleanup of cross-file duplicates.
-Iteratively removes ALL dead code until no duplicates remain.
+Complete cleanup of cross-file duplicates.
+Removes ALL dead code in a single pass: every key that a higher-priority
+file also defines is commented out of the lower-priority file.
 """
 
-import csv
+import os
+import shutil
 import sys
-from collections import defaultdict
+import tempfile
 from pathlib import Path
 
+from localisation_utils import decode_key, iter_keys_bytes, map_files_in_parallel
+
+def load_file_keys(filepath: Path) -> set:
+    """Load the set of keys one file defines."""
+    lines = filepath.read_bytes().splitlines()
+    return {key for key, _, _ in iter_keys_bytes(lines)}
+
 def load_all_keys(localisation_path: Path):
     """Load all keys from all files with their priority."""
-    files_with_priority = []
-    for filepath in sorted(localisation_path.glob('*.csv'), reverse=True):
-        files_with_priority.append(filepath)
+    with os.scandir(localisation_path) as entries:
+        files_with_priority = sorted(
+            (Path(e.path) for e in entries if e.name.lower().endswith('.csv') and e.is_file()),
+            reverse=True
+        )
 
-    # Load all keys: filename -> {key: (line_num, full_row)}
+    # Load all keys: filename -> set of keys
     file_keys = {}
-    for filepath in files_with_priority:
-        keys = {}
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            reader = csv.reader(f, delimiter=';')
-            for line_num, row in enumerate(reader, 1):
-                if not row or not row[0]:
-                    continue
-                key = row[0].strip()
-                if key and not key.startswith('#'):
-                    keys[key] = (line_num, row)
-        file_keys[filepath.name] = keys
+    for filepath, keys in zip(files_with_priority,
+                              map_files_in_parallel(load_file_keys, files_with_priority)):
+        # Interned here: keys from a worker process arrive as fresh copies
+        file_keys[filepath.name] = set(map(sys.intern, keys))
 
     return files_with_priority, file_keys
 
 def find_all_dead_keys(files_with_priority, file_keys):
     """Find ALL keys in lower-priority files that exist in higher-priority files."""
-    dead_keys = defaultdict(set)  # filename -> set of keys to remove
+    dead_keys = {}  # filename -> set of keys to remove
+    seen = set()    # every key defined by a higher-priority file so far
 
-    for i, lower_filepath in enumerate(files_with_priority):
-        lower_file = lower_filepath.name
-        if lower_file not in file_keys:
+    # Single sweep from highest to lowest priority
+    for filepath in files_with_priority:
+        keys = file_keys.get(filepath.name)
+        if keys is None:
             continue
 
-        # Check all higher priority files
-        for higher_filepath in files_with_priority[:i]:
-            higher_file = higher_filepath.name
-            if higher_file not in file_keys:
-                continue
-
-            # Find keys in lower file that exist in higher file
-            for key in file_keys[lower_file].keys():
-                if key in file_keys[higher_file]:
-                    dead_keys[lower_file].add(key)
-                    break  # Found in a higher file, mark for removal
+        dead = seen.intersection(keys)
+        if dead:
+            dead_keys[filepath.name] = dead
+        seen.update(keys)
 
     return dead_keys
 
 def remove_keys_from_file(filepath: Path, keys_to_remove: set) -> int:
-    """Remove specified keys from a CSV file."""
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        lines = f.readlines()
+    """Remove specified keys from a CSV file.
 
+    The result is streamed into a temporary file next to the original, which
+    then atomically replaces it - a crash never leaves a half-written CSV.
+    """
+    lines = filepath.read_bytes().splitlines(keepends=True)
     removed_count = 0
-    new_lines = []
 
-    for line in lines:
-        should_remove = False
-        line_key = line.split(';')[0].strip() if line and ';' in line else ''
-
-        if line_key and line_key in keys_to_remove:
-            should_remove = True
-            removed_count += 1
-            # Add comment instead of deleting
-            new_lines.append(f"# {line_key} removed - overridden by higher priority file\n")
-
-        if not should_remove:
-            new_lines.append(line)
-
-    with open(filepath, 'w', encoding='utf-8', errors='replace') as f:
-        f.writelines(new_lines)
+    tmp = tempfile.NamedTemporaryFile('wb', dir=filepath.parent, delete=False)
+    try:
+        with tmp:
+            for line in lines:
+                head, sep, _ = line.partition(b';')
+                line_key = decode_key(head).strip() if sep else ''
+
+                if line_key and line_key in keys_to_remove:
+                    removed_count += 1
+                    # Add comment instead of deleting, keeping the line's own ending
+                    ending = line[len(line.rstrip(b'\r\n')):] or b'\n'
+                    tmp.write(b'# ' + head.strip() + b' removed - overridden by higher priority file' + ending)
+                else:
+                    tmp.write(line)
+
+        if removed_count:
+            shutil.copymode(filepath, tmp.name)
+            os.replace(tmp.name, filepath)
+    except BaseException:
+        # Never leave a stray temporary file in the localisation folder
+        os.unlink(tmp.name)
+        raise
+
+    if not removed_count:
+        os.unlink(tmp.name)
 
     return removed_count
 
@@ -84,42 +94,28 @@ def main():
     localisation_path = Path('D:\\Steam\\steamapps\\common\\Victoria 2\\mod\\CoE_RoI_R\\localisation')
 
     print("=" * 80)
-    print("COMPLETE RECURSIVE CLEANUP OF CROSS-FILE DUPLICATES")
+    print("COMPLETE CLEANUP OF CROSS-FILE DUPLICATES")
     print("=" * 80)
 
-    iteration = 0
-    total_removed = 0
-
-    while True:
-        iteration += 1
-        print(f"\n--- Iteration {iteration} ---")
-
-        files_with_priority, file_keys = load_all_keys(localisation_path)
-        dead_keys = find_all_dead_keys(files_with_priority, file_keys)
-
-        if not dead_keys:
-            print("\nNo more duplicates to remove!")
-            break
+    files_with_priority, file_keys = load_all_keys(localisation_path)
+    # One sweep finds every overridden key, so a single removal pass suffices
+    dead_keys = find_all_dead_keys(files_with_priority, file_keys)
 
+    total_removed = 0
+    if not dead_keys:
+        print("\nNo duplicates to remove!")
+    else:
         total_dead = sum(len(keys) for keys in dead_keys.values())
-        print(f"Found {total_dead} dead keys in {len(dead_keys)} files")
+        print(f"\nFound {total_dead} dead keys in {len(dead_keys)} files")
 
-        # Remove all dead keys
-        iter_removed = 0
+        # Remove all dead keys, writing each affected file once
         for filename, keys in sorted(dead_keys.items()):
             filepath = localisation_path / filename
             removed = remove_keys_from_file(filepath, keys)
-            iter_removed += removed
+            total_removed += removed
             if removed > 0:
                 print(f"  {filename}: removed {removed} keys")
 
-        total_removed += iter_removed
-        print(f"Iteration {iteration} removed: {iter_removed} keys")
-
-        if iter_removed == 0:
-            print("\nNo keys removed in this iteration - cleanup complete!")
-            break
-
     print("\n" + "=" * 80)
     print(f"CLEANUP COMPLETE - Total keys removed: {total_removed}")
     print("=" * 80)
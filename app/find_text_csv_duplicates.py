@@ -6,41 +6,33 @@ This helps identify which entries should be removed from text.csv
 since it has the lowest load priority.
 """
 
-import csv
+import os
 import sys
 from collections import defaultdict
 from pathlib import Path
 
+from localisation_utils import iter_keys_bytes
+
 def find_text_csv_duplicates(localisation_path: str):
     """Find all keys in text.csv that exist in other files."""
     localisation_path = Path(localisation_path)
 
     # Load all files except text.csv
     file_data = {}
-    for filepath in sorted(localisation_path.glob('*.csv'), reverse=True):
+    with os.scandir(localisation_path) as entries:
+        csv_files = sorted(
+            (Path(e.path) for e in entries if e.name.lower().endswith('.csv') and e.is_file()),
+            reverse=True
+        )
+    for filepath in csv_files:
         if filepath.name == 'text.csv':
             continue
-        data = []
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            reader = csv.reader(f, delimiter=';')
-            for row in reader:
-                if not row or not row[0]:
-                    continue
-                key = row[0].strip()
-                if key and not key.startswith('#'):
-                    data.append(key)
-        file_data[filepath.name] = set(data)
+        lines = filepath.read_bytes().splitlines()
+        file_data[filepath.name] = {key for key, _, _ in iter_keys_bytes(lines)}
 
     # Load text.csv
-    text_keys = []
-    with open(localisation_path / 'text.csv', 'r', encoding='utf-8', errors='replace') as f:
-        reader = csv.reader(f, delimiter=';')
-        for row in reader:
-            if not row or not row[0]:
-                continue
-            key = row[0].strip()
-            if key and not key.startswith('#'):
-                text_keys.append((key, row))
+    lines = (localisation_path / 'text.csv').read_bytes().splitlines()
+    text_keys = [(key, line) for key, _, line in iter_keys_bytes(lines)]
 
     # Find duplicates
     duplicates = []
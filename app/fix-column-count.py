@@ -6,17 +6,67 @@ Victoria 2 Localisation Column Count Fixer
 Fixes CSV files to match Victoria 2's exact 19-column format.
 """
 
+import io
 import os
+import re
 import sys
 import shutil
 import argparse
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
 from typing import Tuple, List
 
+from localisation_utils import map_files_in_parallel, replace_file
+
 TARGET_COLUMNS = 19
 
-def fix_file_column_count(file_path: Path, dry_run=False, no_backup=False) -> Tuple[bool, str]:
+# The first 14 fields of a line (all of it when it has fewer)
+FIRST_FIELDS_RE = re.compile(rb'[^;]*(?:;[^;]*){0,13}')
+
+# Text columns end with the 'x' marker, followed by the unused columns
+ROW_TAIL = b';x' + b';' * (TARGET_COLUMNS - 15)
+
+# Bytes that str.strip() removes once decoded as Windows-1252
+WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\xa0'
+
+# Bytes Windows-1252 leaves undefined: a file containing one is not cp1252
+CP1252_UNDEFINED = b'\x81\x8d\x8f\x90\x9d'
+
+def _utf8_to_cp1252(content: bytes) -> bytes:
+    """
+    Transcode content from UTF-8 to Windows-1252 when it is not cp1252 already.
+
+    Only a file holding a byte cp1252 leaves undefined fails to decode as
+    cp1252; if it is valid UTF-8 (U+00C1 is C3 81, say) it is re-encoded
+    for the game. Anything else is kept byte for byte.
+    """
+    if len(content.translate(None, CP1252_UNDEFINED)) == len(content):
+        return content
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content
+    return text.encode('cp1252', errors='replace')
+
+def _detect_line_ending(content: bytes) -> bytes:
+    """
+    Return the line ending used by the first line of the raw file content.
+
+    Defaults to Victoria 2's \\r\\r\\n when the file has no line feed at all.
+    """
+    i = content.find(b'\n')
+    if i < 0:
+        return b'\r\r\n'
+    if content[max(0, i - 2):i] == b'\r\r':
+        return b'\r\r\n'
+    if content[i - 1:i] == b'\r':
+        return b'\r\n'
+    return b'\n'
+
+def fix_file_column_count(file_path: Path, dry_run=False, no_backup=False,
+                          backup_suffix=None) -> Tuple[bool, str]:
     """
     Fix column count in a single CSV file.
 
@@ -24,6 +74,7 @@ def fix_file_column_count(file_path: Path, dry_run=False, no_backup=False) -> Tu
         file_path: Path to the CSV file
         dry_run: Simulate only
         no_backup: Skip backup creation
+        backup_suffix: Suffix for the backup file (default: timestamp of this call)
 
     Returns:
         Tuple of (success, message)
@@ -34,69 +85,50 @@ def fix_file_column_count(file_path: Path, dry_run=False, no_backup=False) -> Tu
             content = f.read()
 
         original_size = len(content)
+        content = _utf8_to_cp1252(content)
 
-        # Decode for processing (handle both cp1252 and utf-8)
-        try:
-            text = content.decode('cp1252')
-        except UnicodeDecodeError:
-            text = content.decode('utf-8', errors='replace')
-
-        lines = text.split('\n')
-
-        # Preserve the exact line ending from the file (simple heuristic)
-        line_ending = b'\r\r\n'
-        for line in lines[:10]:
-            if line.strip():
-                idx = content.find(line.encode('cp1252', errors='replace'))
-                if idx >= 0:
-                    remaining = content[idx + len(line):]
-                    if remaining.startswith(b'\r\r\n'):
-                        line_ending = b'\r\r\n'
-                    elif remaining.startswith(b'\r\n'):
-                        line_ending = b'\r\n'
-                    elif remaining.startswith(b'\n'):
-                        line_ending = b'\n'
-                    break
-
-        fixed_lines = []
-        changed = False
+        # Work on the raw bytes: every delimiter is ASCII, so the text in
+        # any encoding passes through untouched
+        lines = content.split(b'\n')
+
+        # Fast path for files that are already correct: every line (bar the
+        # empty one after a final line feed) has 19 columns, counted in C
+        body = lines[:-1] if not lines[-1] else lines
+        if set(map(bytes.count, body, repeat(b';'))) <= {TARGET_COLUMNS - 1}:
+            return True, f"Already correct ({len(lines)} lines, {TARGET_COLUMNS} cols)"
 
-        for i, line in enumerate(lines):
-            if not line.strip():
-                fixed_lines.append(line)
-                continue
+        # Preserve the exact line ending from the file
+        line_ending = _detect_line_ending(content)
 
-            parts = line.rstrip('\r\n').split(';')
+        # Fixed lines go straight into one buffer instead of a list to join
+        out = io.BytesIO()
+        write = out.write
+        changed = False
 
-            if len(parts) == TARGET_COLUMNS:
-                fixed_lines.append(line.rstrip('\r\n'))
-                continue
+        for line in lines:
+            line = line.rstrip(b'\r')
 
-            changed = True
-            
-            # Fix strategy
-            if len(parts) >= 14:
-                new_parts = parts[:14]
+            if not line.strip(WHITESPACE) or line.count(b';') == TARGET_COLUMNS - 1:
+                write(line)
             else:
-                new_parts = parts[:]
-                while len(new_parts) < 14:
-                    new_parts.append('')
+                changed = True
 
-            new_parts.append('x')
-            while len(new_parts) < TARGET_COLUMNS:
-                new_parts.append('')
+                # Fix strategy: keep the first 14 columns, padding short lines
+                head = FIRST_FIELDS_RE.match(line).group()
+                write(head)
+                write(b';' * (13 - head.count(b';')))
+                write(ROW_TAIL)
 
-            fixed_lines.append(';'.join(new_parts))
+            write(line_ending)
 
         if not changed:
             return True, f"Already correct ({len(lines)} lines, {TARGET_COLUMNS} cols)"
 
-        # Re-encode
-        fixed_content = line_ending.decode('latin1').join(fixed_lines)
-        fixed_bytes = fixed_content.encode('cp1252', errors='replace')
+        # The empty piece after a final line feed is not a line of its own
+        if len(lines) > 1 and not lines[-1].rstrip(b'\r'):
+            out.truncate(out.tell() - len(line_ending))
 
-        if not fixed_bytes.endswith(line_ending):
-             fixed_bytes += line_ending
+        fixed_bytes = out.getvalue()
 
         new_size = len(fixed_bytes)
 
@@ -105,15 +137,16 @@ def fix_file_column_count(file_path: Path, dry_run=False, no_backup=False) -> Tu
 
         # Backup
         if not no_backup:
-            backup_path = file_path.with_suffix(file_path.suffix + '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S'))
+            if backup_suffix is None:
+                backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = file_path.with_suffix(file_path.suffix + backup_suffix)
             try:
-                shutil.copy2(file_path, backup_path)
+                shutil.copyfile(file_path, backup_path)
             except Exception as e:
                 return False, f"Backup failed: {e}"
 
         # Write fixed content
-        with open(file_path, 'wb') as f:
-            f.write(fixed_bytes)
+        replace_file(file_path, fixed_bytes)
 
         msg = f"Fixed: lines={len(lines)} ({original_size}->{new_size} bytes)"
         if not no_backup:
@@ -156,7 +189,9 @@ def main():
     if target_path.is_file():
         files = [target_path]
     else:
-        files = sorted(target_path.glob("*.csv"))
+        with os.scandir(target_path) as entries:
+            files = sorted(Path(entry.path) for entry in entries
+                           if entry.name.lower().endswith('.csv') and entry.is_file())
 
     if not files:
         print("No CSV files found!")
@@ -170,8 +205,14 @@ def main():
     skipped_count = 0
     error_count = 0
 
-    for file_path in files:
-        success, message = fix_file_column_count(file_path, dry_run=args.dry_run, no_backup=args.no_backup)
+    # One timestamp for the whole run, so its backups share a suffix
+    backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    fix_file = partial(fix_file_column_count, dry_run=args.dry_run, no_backup=args.no_backup,
+                       backup_suffix=backup_suffix)
+    outcomes = map_files_in_parallel(fix_file, files)
+
+    for file_path, (success, message) in zip(files, outcomes):
         results.append((file_path, success, message))
 
         if success:
@@ -6,66 +6,91 @@ Victoria 2 CSV Structure Fixer
 Forces all CSV files to match Victoria 2's exact column structure.
 """
 
+import io
+import os
+import re
 import sys
 import argparse
 import shutil
+from contextlib import redirect_stdout
+from functools import partial
 from pathlib import Path
 from datetime import datetime
+from typing import Tuple
 
+from localisation_utils import map_files_in_parallel, replace_file
 
-def fix_csv_file(file_path: Path, dry_run=False, no_backup=False) -> bool:
+# The first 14 fields of a line (all of it when it has fewer)
+FIRST_FIELDS_RE = re.compile(rb'[^;]*(?:;[^;]*){0,13}')
+
+# An 'x' column anywhere but the first field, whitespace around it included
+STRAY_X_RE = re.compile(rb';[ \t\r\x0b\x0c\x1c-\x1f\xa0]*x[ \t\r\x0b\x0c\x1c-\x1f\xa0]*(?=;|$)')
+
+# Text columns end with the 'x' marker, followed by four unused columns
+ROW_TAIL = b';x;;;;'
+
+# Bytes that str.strip() removes once decoded as Windows-1252
+WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\xa0'
+
+# Bytes Windows-1252 leaves undefined: a file containing one is not cp1252
+CP1252_UNDEFINED = b'\x81\x8d\x8f\x90\x9d'
+
+def _utf8_to_cp1252(content: bytes) -> bytes:
+    """
+    Transcode content from UTF-8 to Windows-1252 when it is not cp1252 already.
+
+    Only a file holding a byte cp1252 leaves undefined fails to decode as
+    cp1252; if it is valid UTF-8 (U+00C1 is C3 81, say) it is re-encoded
+    for the game. Anything else is kept byte for byte.
+    """
+    if len(content.translate(None, CP1252_UNDEFINED)) == len(content):
+        return content
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content
+    return text.encode('cp1252', errors='replace')
+
+
+def fix_csv_file(file_path: Path, dry_run=False, no_backup=False, backup_suffix=None) -> bool:
     """Fix a single CSV file to exact Victoria 2 format."""
     try:
         # Read as binary to preserve encoding
         with open(file_path, 'rb') as f:
             content = f.read()
 
-        # Decode (try cp1252 first, then utf-8)
-        try:
-            text = content.decode('cp1252')
-        except UnicodeDecodeError:
-            text = content.decode('utf-8', errors='replace')
+        # Work on the raw bytes: every delimiter is ASCII, so the text in
+        # any encoding passes through untouched
+        lines = _utf8_to_cp1252(content).split(b'\n')
 
-        lines = text.split('\n')
-        fixed_lines = []
-        
-        # Check if change matches current state to avoid needless writes could be done,
-        # but exact byte matching on decoded/re-encoded text is tricky.
-        # So we reconstruct and see.
+        # Fixed lines go straight into one buffer instead of a list to join
+        out = io.BytesIO()
+        write = out.write
 
         for line in lines:
-            if not line.strip():
-                fixed_lines.append('')
-                continue
-
-            parts = line.rstrip('\r\n').split(';')
-            clean_parts = []
-            for part in parts:
-                if part.strip() == 'x':
-                    if not clean_parts:
-                        clean_parts.append(part)
-                else:
-                    clean_parts.append(part)
-
-            if len(clean_parts) >= 14:
-                new_parts = clean_parts[:14]
-            else:
-                new_parts = clean_parts[:]
-                while len(new_parts) < 14:
-                    new_parts.append('')
-
-            new_parts.append('x')
-            while len(new_parts) < 19:
-                new_parts.append('')
-
-            fixed_lines.append(';'.join(new_parts))
-
-        fixed_content = '\r\r\n'.join(fixed_lines)
-        if not fixed_content.endswith('\r\r\n'):
-            fixed_content += '\r\r\n'
-
-        fixed_bytes = fixed_content.encode('cp1252', errors='replace')
-        
+            line = line.rstrip(b'\r')
+
+            # Already in final form: 19 columns ending in the 'x' marker
+            # with no misplaced 'x' column before it
+            if (line.count(b';') == 18 and line.endswith(ROW_TAIL)
+                    and not STRAY_X_RE.search(line, 0, len(line) - len(ROW_TAIL))):
+                write(line)
+            elif line.strip(WHITESPACE):
+                # Drop misplaced 'x' columns, then keep the first 14 columns
+                line = STRAY_X_RE.sub(b'', line)
+                head = FIRST_FIELDS_RE.match(line).group()
+                write(head)
+                write(b';' * (13 - head.count(b';')))
+                write(ROW_TAIL)
+
+            write(b'\r\r\n')
+
+        # A blank piece after the last line feed is not a line of its own
+        if len(lines) > 1 and not lines[-1].strip(WHITESPACE):
+            out.truncate(out.tell() - 3)
+
+        fixed_bytes = out.getvalue()
+
         # Simple check if anything effectively changed
         if fixed_bytes == content:
              return True # No changes needed
@@ -76,15 +101,16 @@ def fix_csv_file(file_path: Path, dry_run=False, no_backup=False) -> bool:
 
         # Backup
         if not no_backup:
-            backup_path = file_path.with_suffix(file_path.suffix + '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S'))
+            if backup_suffix is None:
+                backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = file_path.with_suffix(file_path.suffix + backup_suffix)
             try:
-                shutil.copy2(file_path, backup_path)
+                shutil.copyfile(file_path, backup_path)
             except Exception as e:
                 print(f"  [WARN] Backup failed: {e}")
 
         # Write back
-        with open(file_path, 'wb') as f:
-            f.write(fixed_bytes)
+        replace_file(file_path, fixed_bytes)
 
         return True
 
@@ -93,6 +119,16 @@ def fix_csv_file(file_path: Path, dry_run=False, no_backup=False) -> bool:
         return False
 
 
+def fix_csv_file_captured(file_path: Path, dry_run=False, no_backup=False,
+                          backup_suffix=None) -> Tuple[bool, str]:
+    """Run fix_csv_file, returning its result along with everything it printed."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        success = fix_csv_file(file_path, dry_run=dry_run, no_backup=no_backup,
+                               backup_suffix=backup_suffix)
+    return success, output.getvalue()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fix V2 CSV structure.")
     parser.add_argument("path", nargs="?", help="Target file or directory")
@@ -124,7 +160,9 @@ def main():
     if target_path.is_file():
         files = [target_path]
     else:
-        files = sorted(target_path.glob("*.csv"))
+        with os.scandir(target_path) as entries:
+            files = sorted(Path(entry.path) for entry in entries
+                           if entry.name.lower().endswith('.csv') and entry.is_file())
 
     if not files:
         print("No CSV files found!")
@@ -133,9 +171,17 @@ def main():
     print(f"Processing {len(files)} file(s)...")
     print()
 
+    # One timestamp for the whole run, so its backups share a suffix
+    backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    fix_file = partial(fix_csv_file_captured, dry_run=args.dry_run, no_backup=args.no_backup,
+                       backup_suffix=backup_suffix)
+    outcomes = map_files_in_parallel(fix_file, files)
+
     fixed = 0
-    for file_path in files:
-        if fix_csv_file(file_path, dry_run=args.dry_run, no_backup=args.no_backup):
+    for file_path, (success, output) in zip(files, outcomes):
+        sys.stdout.write(output)
+        if success:
             print(f"  [OK] {file_path.name}")
             fixed += 1
         else:
@@ -13,11 +13,15 @@ import os
 import sys
 import shutil
 import argparse
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 from typing import Tuple, List
 
-def fix_file_line_endings(file_path: Path, dry_run=False, no_backup=False) -> Tuple[bool, str]:
+from localisation_utils import map_files_in_parallel, replace_file
+
+def fix_file_line_endings(file_path: Path, dry_run=False, no_backup=False,
+                          backup_suffix=None) -> Tuple[bool, str]:
     """
     Fix line endings in a single CSV file.
     
@@ -25,6 +29,7 @@ def fix_file_line_endings(file_path: Path, dry_run=False, no_backup=False) -> Tu
         file_path: Path to the CSV file
         dry_run: Simulate only
         no_backup: specific flag to skip backup
+        backup_suffix: Suffix for the backup file (default: timestamp of this call)
         
     Returns:
         Tuple of (success, message)
@@ -36,6 +41,11 @@ def fix_file_line_endings(file_path: Path, dry_run=False, no_backup=False) -> Tu
 
         original_size = len(content)
 
+        # Every line feed already preceded by two carriage returns means the
+        # steps below would reproduce the content unchanged
+        if content.count(b'\n') == content.count(b'\r\r\n'):
+            return True, f"Already correct ({original_size} bytes)"
+
         # First, normalize any existing \r\n to single \n for consistent processing
         normalized = content.replace(b'\r\n', b'\n')
 
@@ -45,26 +55,25 @@ def fix_file_line_endings(file_path: Path, dry_run=False, no_backup=False) -> Tu
         # Remove any accidental triple carriage returns that might have occurred
         fixed = fixed.replace(b'\r\r\r\n', b'\r\r\n')
 
+        # At least one line feed gained a carriage return, so the content
+        # changed and grew: no need to compare it with the original
         new_size = len(fixed)
 
-        # Check if file actually needed fixing
-        if fixed == content:
-            return True, f"Already correct ({original_size} bytes)"
-
         if dry_run:
             return True, f"[DRY RUN] Would fix: {original_size} -> {new_size} bytes"
 
         # Create backup
         if not no_backup:
-            backup_path = file_path.with_suffix(file_path.suffix + '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S'))
+            if backup_suffix is None:
+                backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = file_path.with_suffix(file_path.suffix + backup_suffix)
             try:
-                shutil.copy2(file_path, backup_path)
+                shutil.copyfile(file_path, backup_path)
             except Exception as e:
                 return False, f"Backup failed: {e}"
 
         # Write fixed content
-        with open(file_path, 'wb') as f:
-            f.write(fixed)
+        replace_file(file_path, fixed)
 
         msg = f"Fixed: {original_size} -> {new_size} bytes"
         if not no_backup:
@@ -121,7 +130,9 @@ def main():
     if target_path.is_file():
         files = [target_path]
     else:
-        files = sorted(target_path.glob("*.csv"))
+        with os.scandir(target_path) as entries:
+            files = sorted(Path(entry.path) for entry in entries
+                           if entry.name.lower().endswith('.csv') and entry.is_file())
 
     if not files:
         print("No CSV files found!")
@@ -136,8 +147,14 @@ def main():
     skipped_count = 0
     error_count = 0
 
-    for file_path in files:
-        success, message = fix_file_line_endings(file_path, dry_run=args.dry_run, no_backup=args.no_backup)
+    # One timestamp for the whole run, so its backups share a suffix
+    backup_suffix = '.bak_' + datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    fix_file = partial(fix_file_line_endings, dry_run=args.dry_run, no_backup=args.no_backup,
+                       backup_suffix=backup_suffix)
+    outcomes = map_files_in_parallel(fix_file, files)
+
+    for file_path, (success, message) in zip(files, outcomes):
         results.append((file_path, success, message))
 
         if success:
@@ -17,6 +17,7 @@ Options:
     --dry-run       Preview changes without modifying files
     --verbose       Show detailed output for each file
     --json          Output results in JSON format
+    --no-cache      Re-check every file, even those unchanged since the last clean run
     -h, --help      Show this help message
 
 Fixes Applied:
@@ -30,11 +31,60 @@ import os
 import sys
 import json
 import shutil
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field, asdict
 
+from localisation_utils import map_files_in_parallel, replace_file
+
+
+# Bytes that str.strip() removes once decoded as Windows-1252
+WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\xa0'
+
+# What '\r\n' becomes when written through a newline='\r\n' text stream
+LINE_ENDING = b'\r\r\n'
+
+# Bytes with no Windows-1252 mapping come back as '?' after a replace round-trip
+CP1252_UNDEFINED = bytes.maketrans(b'\x81\x8d\x8f\x90\x9d', b'?????')
+
+# Files found clean by a live run are skipped until they change, tracked in
+# this file in the localisation directory itself (the game only reads *.csv)
+CACHE_FILENAME = '.fix_localisation_cache.json'
+
+
+def _file_signature(file_path: Path) -> Tuple[int, int]:
+    """Modification time and size, enough to tell a file was not touched."""
+    st = file_path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_cache(cache_path: Path) -> Dict[str, Tuple[int, int]]:
+    """Load {filename: (mtime_ns, size)} of clean files. Empty if unusable."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return {name: tuple(sig) for name, sig in cache.items()}
+    except Exception:
+        return {}
+
+
+def _save_cache(cache_path: Path, cache: Dict[str, Tuple[int, int]]) -> None:
+    """Write the cache atomically; failure to write is not an error."""
+    try:
+        tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_path.parent,
+                                          delete=False)
+        try:
+            with tmp:
+                json.dump(cache, tmp)
+            os.replace(tmp.name, cache_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+    except OSError as e:
+        sys.stderr.write(f"Warning: could not write cache {cache_path}: {e}\n")
+
 
 @dataclass
 class FileFixResult:
@@ -48,6 +98,7 @@ class FileFixResult:
     errors: List[str] = field(default_factory=list)
     skipped: bool = False
     skip_reason: str = ""
+    fixed: bool = False
 
 
 @dataclass
@@ -68,50 +119,53 @@ class LocalisationFixerV2:
     def __init__(self, target_path: Path, 
                  dry_run: bool = False,
                  verbose: bool = False,
-                 json_output: bool = False):
+                 json_output: bool = False,
+                 use_cache: bool = True):
         self.target_path = target_path
         self.dry_run = dry_run
         self.verbose = verbose
         self.json_output = json_output
+        self.use_cache = use_cache
         self.result = FixRunResult()
         self.result.timestamp = datetime.now().isoformat()
         self.result.dry_run = dry_run
 
-    def detect_encoding(self, file_path: Path) -> str:
-        """Detect file encoding."""
-        try:
-            with open(file_path, 'rb') as f:
-                raw = f.read()
-            
-            if raw.startswith(b'\xef\xbb\xbf'):
-                return 'utf-8-bom'
-            
+    def detect_encoding(self, raw: bytes) -> str:
+        """Detect the encoding of a file's raw contents."""
+        if raw.startswith(b'\xef\xbb\xbf'):
+            return 'utf-8-bom'
+        
+        # Plain ASCII needs no UTF-8 handling
+        if not raw.isascii():
             try:
-                decoded = raw.decode('utf-8')
-                if any(ord(c) > 127 for c in decoded):
-                    return 'utf-8'
+                raw.decode('utf-8')
+                return 'utf-8'
             except UnicodeDecodeError:
                 pass
-            
-            return 'cp1252'
-        except Exception as e:
-            return f'error: {e}'
-
-    def read_file_content(self, file_path: Path) -> Tuple[List[str], str]:
-        """Read file content handling various encodings."""
-        encoding = self.detect_encoding(file_path)
         
+        return 'cp1252'
+
+    def read_file_content(self, file_path: Path) -> Tuple[List[bytes], str]:
+        """
+        Read file content handling various encodings.
+
+        Lines come back as Windows-1252 bytes without their line endings,
+        split on \\r, \\n and \\r\\n exactly like text-mode reading.
+        """
         try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+
+            encoding = self.detect_encoding(raw)
             if encoding == 'utf-8-bom':
-                with open(file_path, 'r', encoding='utf-8-sig') as f:
-                    return f.readlines(), encoding
+                text = raw.decode('utf-8-sig')
             elif encoding == 'utf-8':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.readlines(), encoding
+                text = raw.decode('utf-8')
             else:
-                # Fallback to cp1252 with replace for safety
-                with open(file_path, 'r', encoding='cp1252', errors='replace') as f:
-                    return f.readlines(), encoding
+                # Already cp1252: only the undefined bytes change on a round-trip
+                return raw.translate(CP1252_UNDEFINED).splitlines(), encoding
+
+            return text.encode('cp1252', errors='replace').splitlines(), encoding
         except Exception as e:
             raise RuntimeError(f"Failed to read file: {e}")
 
@@ -121,30 +175,25 @@ class LocalisationFixerV2:
             return
         backup_path = file_path.with_suffix('.csv.bak')
         try:
-            shutil.copy2(file_path, backup_path)
+            shutil.copyfile(file_path, backup_path)
         except Exception:
             pass
 
-    def fix_line(self, line: str, target_columns: int) -> Tuple[str, bool, bool]:
+    def fix_line(self, line: bytes, target_columns: int) -> Tuple[bytes, bool, bool]:
         """Fix a single line to match target columns."""
-        original = line.rstrip('\r\n')
+        original = line.rstrip(b'\r\n')
+
+        # Already correct: right column count and an exact 'x' terminator
+        if original.endswith(b';x') and original.count(b';') == target_columns - 1:
+            return original, False, False
         
-        if not original.strip() or original.strip().startswith('#'):
+        stripped = original.strip(WHITESPACE)
+        if not stripped or stripped.startswith(b'#'):
             return original, False, False
         
         semicolon_fixed = False
         column_fixed = False
         
-        parts = original.split(';')
-        
-        # Determine actual content (removing 'x' terminator garbage)
-        content = []
-        for i, p in enumerate(parts):
-            # The 'x' usually marks the end. But sometimes 'x' is just a column value?
-            # In V2, the last column must be 'x'.
-            # If we are strictly enforcing column count, we just grab everything and resizing.
-            content.append(p)
-            
         # We need exactly target_columns.
         # The last column MUST be 'x'.
         
@@ -157,48 +206,39 @@ class LocalisationFixerV2:
         # 2. Take middle parts (Translations)
         # 3. Force last part to be 'x' and ensure length matches
         
-        current_len = len(parts)
+        current_len = original.count(b';') + 1
         
         if current_len == target_columns:
-            # Check check if ends with x
-            if parts[-1].strip() != 'x':
-                parts[-1] = 'x'
+            # Only the last column can be wrong, no need to split the rest
+            head, sep, last = original.rpartition(b';')
+            if last.strip(WHITESPACE) != b'x':
                 semicolon_fixed = True # technically content fixed but fits here
-            
-            fixed = ';'.join(parts)
-            if fixed != original:
-                 semicolon_fixed = True
-            
-            # Check for missing ;x
-            if not original.endswith(';x') and not original.endswith(';x\t'):
-                 # It might be correctly formatted but missing strict ending char or has trailing verify
-                 pass
+                return head + sep + b'x', semicolon_fixed, column_fixed
 
-            return fixed, semicolon_fixed, column_fixed
+            return original, semicolon_fixed, column_fixed
 
         # Resize needed
         column_fixed = True
+        parts = original.split(b';')
         
         if current_len > target_columns:
             # Truncate
             new_parts = parts[:target_columns]
-            new_parts[-1] = 'x' # Ensure terminator
+            new_parts[-1] = b'x' # Ensure terminator
         else:
             # Pad
-            new_parts = parts[:]
+            new_parts = parts
             # If the last part was 'x', we should keep it as 'x' at the end?
             # Or just pad with empty strings and append 'x'?
             
             # Prune existing 'x' if it's there but early
-            if new_parts[-1].strip() == 'x':
+            if new_parts[-1].strip(WHITESPACE) == b'x':
                 new_parts.pop()
                 
-            while len(new_parts) < target_columns - 1:
-                new_parts.append('')
-            
-            new_parts.append('x')
+            new_parts += [b''] * (target_columns - 1 - len(new_parts))
+            new_parts.append(b'x')
             
-        fixed = ';'.join(new_parts)
+        fixed = b';'.join(new_parts)
         return fixed, semicolon_fixed, column_fixed
 
     def fix_file(self, file_path: Path) -> FileFixResult:
@@ -218,18 +258,23 @@ class LocalisationFixerV2:
             return result
 
         # Determine target columns from header
-        header = lines[0].rstrip('\r\n')
-        target_columns = len(header.split(';'))
+        header = lines[0]
+        target_columns = header.count(b';') + 1
         result.target_columns = target_columns
         result.lines_total = len(lines)
         
-        fixed_lines = [header] # Keep header as is
+        # Output is built in one buffer, each line preceded by the previous
+        # one's line ending
+        out = bytearray(header) # Keep header as is
+        fixed = header
         
         has_changes = False
         
-        for i, line in enumerate(lines[1:], 1):
-            fixed, sem_fixed, col_fixed = self.fix_line(line, target_columns)
-            fixed_lines.append(fixed)
+        fix_line = self.fix_line
+        for line in lines[1:]:
+            fixed, sem_fixed, col_fixed = fix_line(line, target_columns)
+            out += LINE_ENDING
+            out += fixed
             
             if sem_fixed:
                 result.lines_fixed_semicolon += 1
@@ -237,9 +282,6 @@ class LocalisationFixerV2:
             if col_fixed:
                 result.lines_fixed_columns += 1
                 has_changes = True
-                
-            if fixed != line.rstrip('\r\n'):
-                 has_changes = True
 
         # Check for encoding change requirement
         if encoding != 'cp1252':
@@ -248,20 +290,17 @@ class LocalisationFixerV2:
         if has_changes:
             if not self.dry_run:
                 self.create_backup(file_path)
+                # A blank last line gets no line ending of its own
+                if fixed.strip(WHITESPACE):
+                    out += LINE_ENDING
                 try:
-                    with open(file_path, 'w', encoding='cp1252', newline='\r\n', errors='replace') as f:
-                        f.write('\r\n'.join(fixed_lines))
-                        if fixed_lines and not fixed_lines[-1].strip():
-                            pass
-                        else:
-                            f.write('\r\n')
+                    replace_file(file_path, out)
                 except Exception as e:
                     result.errors.append(f"Write error: {e}")
                     return result
             
-            self.result.files_fixed += 1
-            
-        self.result.total_lines_fixed += result.lines_fixed_semicolon + result.lines_fixed_columns
+            result.fixed = True
+
         return result
 
     def run(self):
@@ -272,13 +311,52 @@ class LocalisationFixerV2:
             
         if self.target_path.is_file():
             files = [self.target_path]
+        elif self.target_path.is_dir():
+            with os.scandir(self.target_path) as entries:
+                files = sorted(Path(entry.path) for entry in entries
+                               if entry.name.lower().endswith('.csv') and entry.is_file())
         else:
-            files = sorted(list(self.target_path.glob("*.csv")))
+            files = []
+
+        # Only whole-directory runs use the cache
+        use_cache = self.use_cache and self.target_path.is_dir()
+        cache_path = self.target_path / CACHE_FILENAME
+        if use_cache:
+            cache = _load_cache(cache_path)
+            signatures = {f.name: _file_signature(f) for f in files}
+            to_fix = [f for f in files if cache.get(f.name) != signatures[f.name]]
+        else:
+            to_fix = files
             
+        # Fix in parallel, then tally and report in file order
+        fixed_results = dict(zip(to_fix, map_files_in_parallel(self.fix_file, to_fix)))
+
+        file_results = []
         for f in files:
-            res = self.fix_file(f)
+            res = fixed_results.get(f)
+            if res is None:
+                res = FileFixResult(file_name=f.name, skipped=True,
+                                    skip_reason="Unchanged since last clean run")
+                self.result.files_skipped += 1
+            file_results.append(res)
+
+        # A live run leaves every error-free file clean, including the ones it rewrote
+        if use_cache and not self.dry_run:
+            new_cache = {
+                f.name: _file_signature(f) if res.fixed else signatures[f.name]
+                for f, res in zip(files, file_results) if not res.errors
+            }
+            # Nothing to write when every file was already clean and unchanged
+            if new_cache != cache:
+                _save_cache(cache_path, new_cache)
+
+        for f, res in zip(files, file_results):
             self.result.file_results.append(res)
             self.result.files_processed += 1
+            if res.fixed:
+                self.result.files_fixed += 1
+            if not res.errors:
+                self.result.total_lines_fixed += res.lines_fixed_semicolon + res.lines_fixed_columns
             
             if self.verbose and not self.json_output:
                 if res.errors:
@@ -289,12 +367,15 @@ class LocalisationFixerV2:
         if not self.json_output:
             print(f"Processed {self.result.files_processed} files.")
             print(f"Fixed {self.result.files_fixed} files.")
+            if self.result.files_skipped:
+                print(f"Skipped {self.result.files_skipped} files unchanged since the last clean run.")
 
 def main():
     args = sys.argv[1:]
     dry_run = '--dry-run' in args
     verbose = '--verbose' in args or '-v' in args
     json_output = '--json' in args
+    use_cache = '--no-cache' not in args
     
     args = [a for a in args if not a.startswith('-')]
     
@@ -308,7 +389,7 @@ def main():
     else:
         target_path = project_root / "CoE_RoI_R" / "localisation"
         
-    fixer = LocalisationFixerV2(target_path, dry_run, verbose, json_output)
+    fixer = LocalisationFixerV2(target_path, dry_run, verbose, json_output, use_cache)
     fixer.run()
 
 if __name__ == "__main__":
@@ -9,8 +9,11 @@ This script normalizes all line endings to LF (Unix-style) which
 git will convert to CRLF on Windows due to core.autocrlf=true.
 """
 
+import os
 from pathlib import Path
 
+from localisation_utils import map_files_in_parallel, replace_file
+
 def fix_line_endings(filepath: Path) -> int:
     """Fix line endings in a single file."""
     with open(filepath, 'rb') as f:
@@ -32,8 +35,9 @@ def fix_line_endings(filepath: Path) -> int:
     content = content.replace(b'\r', b'\n')
 
     if content != original:
-        with open(filepath, 'wb') as f:
-            f.write(content)
+        # Swap in a complete new file so an interrupted run never leaves
+        # the original truncated
+        replace_file(filepath, content)
         return 1
     return 0
 
@@ -48,10 +52,17 @@ def main():
 
     fixed_count = 0
     checked_count = 0
+    files = []
+    if localisation_path.is_dir():
+        with os.scandir(localisation_path) as entries:
+            files = sorted(Path(entry.path) for entry in entries
+                           if entry.name.lower().endswith('.csv') and entry.is_file())
+
+    outcomes = map_files_in_parallel(fix_line_endings, files)
 
-    for filepath in sorted(localisation_path.glob('*.csv')):
+    for filepath, fixed in zip(files, outcomes):
         checked_count += 1
-        if fix_line_endings(filepath):
+        if fixed:
             fixed_count += 1
             print(f"  Fixed: {filepath.name}")
 
@@ -11,11 +11,13 @@ For cross-file value conflicts, creates a report for manual resolution.
 """
 
 import argparse
-import csv
 import os
 import sys
 import shutil
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 
@@ -29,36 +31,67 @@ def safe_print(text: str, max_len: int = 60) -> str:
     return clean_text[:max_len]
 
 
+@dataclass
+class FileRows:
+    """Parsed rows of one CSV file, stored column-wise (one list per field).
+
+    Only what the fixers look at is kept, not the full row: its column
+    count, and for over-long rows whether the end marker is misplaced.
+    """
+    keys: List[str] = field(default_factory=list)
+    english: List[str] = field(default_factory=list)
+    line_nums: 'array[int]' = field(default_factory=lambda: array('i'))
+    col_counts: 'array[int]' = field(default_factory=lambda: array('I'))
+    # Indices of over-long rows whose end-marker column is not 'x'
+    misplaced_markers: Set[int] = field(default_factory=set)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
 class LocalisationFixer:
     """Fixes duplicate localisation keys in Victoria 2 CSV files."""
 
     EXPECTED_COLUMNS = 14
 
-    def __init__(self, localisation_path: str, dry_run: bool = False):
+    def __init__(self, localisation_path: str, dry_run: bool = False,
+                 build_cross_index: bool = True):
         """Initialize the fixer.
 
         Args:
             localisation_path: Path to localisation folder
             dry_run: If True, don't modify files, just report
+            build_cross_index: If False, skip building key_to_files (only the
+                cross-file report and comment key check need it)
         """
         self.localisation_path = Path(localisation_path)
         self.dry_run = dry_run
-        self.file_data: Dict[str, List[Tuple[str, List[str], int]]] = {}
+        self.build_cross_index = build_cross_index
+        self.file_data: Dict[str, FileRows] = {}
         self.key_to_files: Dict[str, List[Tuple[str, int, str]]] = defaultdict(list)
 
-    def load_file(self, filepath: Path) -> List[Tuple[str, List[str], int]]:
-        """Load a CSV file and return parsed data."""
-        data = []
+    @classmethod
+    def load_file(cls, filepath: Path) -> FileRows:
+        """Load a CSV file into column-wise FileRows.
+
+        The English column is extracted once here so consumers never re-index it.
+        """
+        data = FileRows()
+        marker_col = cls.EXPECTED_COLUMNS - 1
         try:
+            # Vic2 localisation has no quoting or escapes, so ';' is a plain
+            # delimiter and str.split is enough (and much cheaper than csv)
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                reader = csv.reader(f, delimiter=';')
-                for line_num, row in enumerate(reader, start=1):
-                    if not row:
-                        continue
-                    if len(row) >= 1:
-                        key = row[0].strip()
-                        if key:
-                            data.append((key, row, line_num))
+                for line_num, line in enumerate(f, start=1):
+                    row = line.rstrip('\r\n').split(';')
+                    key = row[0].strip()
+                    if key:
+                        if len(row) > cls.EXPECTED_COLUMNS and row[marker_col] != 'x':
+                            data.misplaced_markers.add(len(data.keys))
+                        data.keys.append(key)
+                        data.english.append(row[1] if len(row) > 1 else "")
+                        data.line_nums.append(line_num)
+                        data.col_counts.append(len(row))
         except Exception as e:
             print(f"  Error reading {filepath.name}: {e}", file=sys.stderr)
 
@@ -69,16 +102,29 @@ class LocalisationFixer:
         csv_files = sorted(self.localisation_path.glob('*.csv'), reverse=True)
         print(f"Found {len(csv_files)} CSV files\n")
 
-        for filepath in csv_files:
-            print(f"Loading: {filepath.name} ", end='', flush=True)
-            data = self.load_file(filepath)
-            self.file_data[filepath.name] = data
+        # Equal English values (empty ones especially) share one string object
+        value_pool: Dict[str, str] = {}
+
+        # Files parse independently, so load them across processes and only
+        # merge the results here, in load order
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(self.load_file, csv_files, chunksize=4)
+
+            for filepath, data in zip(csv_files, results):
+                filename = filepath.name
+                self.file_data[filename] = data
+
+                # Shared here rather than in the workers, whose objects arrive as
+                # fresh copies: the same key recurs across files and in every index
+                data.keys[:] = map(sys.intern, data.keys)
+                data.english[:] = map(value_pool.setdefault, data.english, data.english)
 
-            for key, columns, line_num in data:
-                english_text = columns[1] if len(columns) > 1 else ""
-                self.key_to_files[key].append((filepath.name, line_num, english_text))
+                if self.build_cross_index:
+                    for key, line_num, english_text in zip(data.keys, data.line_nums,
+                                                           data.english):
+                        self.key_to_files[key].append((filename, line_num, english_text))
 
-            print(f"({len(data)} keys)", flush=True)
+                print(f"Loading: {filename} ({len(data)} keys)", flush=True)
 
     def fix_within_file_duplicates(self, filename: str) -> Tuple[List[Tuple[int, str]], List[str]]:
         """Remove duplicate keys within a single file.
@@ -93,18 +139,18 @@ class LocalisationFixer:
             return [], []
 
         data = self.file_data[filename]
-        seen_keys: Dict[str, int] = {}  # key -> index in data list
-        indices_to_remove: Set[int] = set()
+        first_seen: Dict[str, int] = {}  # key -> index in data of its first occurrence
+        removed: List[Tuple[int, str]] = []
         warnings: List[str] = []
 
         # Find duplicates (keep first occurrence)
-        for data_idx, (key, columns, line_num) in enumerate(data):
-            if key in seen_keys:
-                indices_to_remove.add(data_idx)
-                first_idx = seen_keys[key]
-                first_key, first_columns, first_line = data[first_idx]
-                first_text = first_columns[1] if len(first_columns) > 1 else ""
-                dup_text = columns[1] if len(columns) > 1 else ""
+        for data_idx, (key, line_num, dup_text) in enumerate(zip(data.keys, data.line_nums,
+                                                                 data.english)):
+            first_idx = first_seen.setdefault(key, data_idx)
+            if first_idx != data_idx:
+                removed.append((line_num, dup_text))
+                first_line = data.line_nums[first_idx]
+                first_text = data.english[first_idx]
 
                 if first_text != dup_text:
                     warnings.append(
@@ -112,12 +158,6 @@ class LocalisationFixer:
                         f"  First:  {safe_print(first_text)}..."
                         f"  Duplicate: {safe_print(dup_text)}..."
                     )
-            else:
-                seen_keys[key] = data_idx
-
-        removed = [(line_num, columns[1] if len(columns) > 1 else "")
-                   for data_idx, (key, columns, line_num) in enumerate(data)
-                   if data_idx in indices_to_remove]
 
         return removed, warnings
 
@@ -137,24 +177,24 @@ class LocalisationFixer:
         fixes: List[Tuple[int, str, str]] = []  # (line_num, issue, fix_description)
         warnings: List[str] = []
 
-        for key, columns, line_num in data:
+        for data_idx, (line_num, col_count) in enumerate(zip(data.line_nums, data.col_counts)):
             # Check for column count issues
-            if len(columns) > self.EXPECTED_COLUMNS:
+            if col_count > self.EXPECTED_COLUMNS:
                 fixes.append((
                     line_num,
-                    f"column_count_{len(columns)}",
-                    f"Truncate from {len(columns)} to {self.EXPECTED_COLUMNS} columns"
+                    f"column_count_{col_count}",
+                    f"Truncate from {col_count} to {self.EXPECTED_COLUMNS} columns"
                 ))
-            elif len(columns) < self.EXPECTED_COLUMNS:
+            elif col_count < self.EXPECTED_COLUMNS:
                 # Pad with empty fields
                 fixes.append((
                     line_num,
-                    f"column_count_{len(columns)}",
-                    f"Pad from {len(columns)} to {self.EXPECTED_COLUMNS} columns"
+                    f"column_count_{col_count}",
+                    f"Pad from {col_count} to {self.EXPECTED_COLUMNS} columns"
                 ))
 
             # Check for trailing commas/extra data
-            if len(columns) > self.EXPECTED_COLUMNS and columns[self.EXPECTED_COLUMNS - 1] != 'x':
+            if data_idx in data.misplaced_markers:
                 fixes.append((
                     line_num,
                     "trailing_data",
@@ -186,6 +226,9 @@ class LocalisationFixer:
         with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
             lines = f.readlines()
 
+        # A line can carry several fixes, but they all come down to the same rewrite
+        lines_to_fix = {line_num for line_num, _, _ in format_fixes}
+
         # Apply fixes
         fixed_lines = []
         for i, line in enumerate(lines, start=1):
@@ -193,28 +236,28 @@ class LocalisationFixer:
                 continue
 
             # Apply format fixes
-            for line_num, issue, desc in format_fixes:
-                if line_num == i:
-                    # Parse and fix the line
-                    parts = line.rstrip('\n\r').split(';')
-                    if len(parts) > self.EXPECTED_COLUMNS:
-                        # Truncate
-                        parts = parts[:self.EXPECTED_COLUMNS]
-                    elif len(parts) < self.EXPECTED_COLUMNS:
-                        # Pad
-                        parts += [''] * (self.EXPECTED_COLUMNS - len(parts))
-
-                    # Ensure end marker
-                    if len(parts) >= self.EXPECTED_COLUMNS:
-                        parts[self.EXPECTED_COLUMNS - 1] = 'x'
-
-                    line = ';'.join(parts) + '\n'
+            if i in lines_to_fix:
+                # Parse and fix the line
+                parts = line.rstrip('\n\r').split(';')
+                if len(parts) > self.EXPECTED_COLUMNS:
+                    # Truncate
+                    parts = parts[:self.EXPECTED_COLUMNS]
+                elif len(parts) < self.EXPECTED_COLUMNS:
+                    # Pad
+                    parts += [''] * (self.EXPECTED_COLUMNS - len(parts))
+
+                # Ensure end marker
+                if len(parts) >= self.EXPECTED_COLUMNS:
+                    parts[self.EXPECTED_COLUMNS - 1] = 'x'
+
+                line = ';'.join(parts) + '\n'
 
             fixed_lines.append(line)
 
-        # Write back
+        # Write back in one call: the text layer encodes it once and hands it
+        # straight to the OS instead of flushing it out in 8 KiB chunks
         with open(filepath, 'w', encoding='utf-8', errors='replace') as f:
-            f.writelines(fixed_lines)
+            f.write(''.join(fixed_lines))
 
         return True
 
@@ -256,18 +299,27 @@ class LocalisationFixer:
 
         for key, locations in self.key_to_files.items():
             if len(locations) > 1:
-                # Sort by filename (priority order)
-                sorted_locations = sorted(locations, key=lambda x: x[0], reverse=True)
-
-                # Check if values differ
-                highest_file, highest_line, highest_value = sorted_locations[0]
-                all_same = all(loc[2] == highest_value for loc in sorted_locations)
-
-                if not all_same:
-                    for i in range(1, len(sorted_locations)):
-                        other_file, other_line, other_value = sorted_locations[i]
-                        pair_key = tuple(sorted([highest_file, other_file], reverse=True))
-                        file_pair_dupes[pair_key].append((key, highest_value, other_value))
+                # Check if values differ - order doesn't matter for that, so it
+                # is done first (values are pooled, so equal ones usually
+                # compare by identity)
+                first_value = locations[0][2]
+                for location in locations:
+                    if location[2] != first_value:
+                        break
+                else:
+                    continue
+
+                # Highest filename wins (priority order); the first one on ties,
+                # as a stable sort would give
+                highest = max(locations, key=lambda x: x[0])
+                highest_file, highest_line, highest_value = highest
+
+                for location in locations:
+                    if location is highest:
+                        continue
+                    other_file, other_line, other_value = location
+                    pair_key = tuple(sorted([highest_file, other_file], reverse=True))
+                    file_pair_dupes[pair_key].append((key, highest_value, other_value))
 
         # Generate report by file pair
         for (file1, file2), dupes in sorted(file_pair_dupes.items()):
@@ -344,7 +396,8 @@ def main():
     if args.dry_run:
         print("DRY RUN MODE - No files will be modified\n")
 
-    fixer = LocalisationFixer(args.path, dry_run=args.dry_run)
+    fixer = LocalisationFixer(args.path, dry_run=args.dry_run,
+                              build_cross_index=args.report or args.fix_comments or args.all)
     fixer.analyze_all_files()
 
     if args.report or args.all:
@@ -359,6 +412,11 @@ def main():
         else:
             print("[DRY RUN] Would save report to:", report_path)
 
+    # Fixes from both passes are applied together below, in one rewrite per
+    # file, so the line numbers found at load time stay valid for all of them
+    lines_to_remove: Dict[str, Set[int]] = {}
+    format_fixes: Dict[str, List[Tuple[int, str, str]]] = {}
+
     if args.fix_within or args.all:
         print("\n" + "=" * 70)
         print("FIXING WITHIN-FILE DUPLICATES")
@@ -379,8 +437,8 @@ def main():
                 for warning in warnings:
                     print(f"  {safe_print(warning, 200)}")
 
-            if not args.dry_run and (removed or warnings):
-                fixer.apply_file_fixes(filename, set(line for line, _ in removed), [])
+            if removed:
+                lines_to_remove[filename] = set(line for line, _ in removed)
 
     if args.fix_format or args.all:
         print("\n" + "=" * 70)
@@ -397,8 +455,13 @@ def main():
                 if len(fixes) > 10:
                     print(f"  ... and {len(fixes) - 10} more")
 
-            if not args.dry_run and fixes:
-                fixer.apply_file_fixes(filename, set(), fixes)
+            if fixes:
+                format_fixes[filename] = fixes
+
+    if not args.dry_run:
+        for filename in sorted(lines_to_remove.keys() | format_fixes.keys()):
+            fixer.apply_file_fixes(filename, lines_to_remove.get(filename, set()),
+                                   format_fixes.get(filename, []))
 
     if args.fix_comments or args.all:
         print("\n" + "=" * 70)
@@ -28,7 +28,7 @@ def convert_utf8_to_ansi(input_file, output_file=None):
         output_file = input_file
 
     try:
-        # Read as UTF-8
+        # Read as UTF-8 (universal newlines turn CRLF and lone CR into LF)
         with open(input_file, 'r', encoding='utf-8') as f:
             content = f.read()
 
@@ -36,12 +36,8 @@ def convert_utf8_to_ansi(input_file, output_file=None):
         if content.startswith('\ufeff'):
             content = content[1:]
 
-        # Normalize line endings to CRLF
-        content = content.replace('\r\n', '\n')  # First normalize to LF
-        content = content.replace('\n', '\r\n')   # Then convert to CRLF
-
-        # Write as Windows-1252
-        with open(output_file, 'w', encoding='windows-1252', newline='') as f:
+        # Write as Windows-1252, with every LF going out as CRLF
+        with open(output_file, 'w', encoding='windows-1252', newline='\r\n') as f:
             f.write(content)
 
         sys.stdout.write(f"[OK] Converted: {os.path.basename(input_file)} -> Windows-1252 (ANSI)\n")
@@ -0,0 +1,72 @@
+"""
+Helpers shared by the localisation scripts in this folder.
+
+The scripts are still run directly by path; Python puts their folder on
+sys.path, so they import this module as a sibling.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Below this many files a process pool costs more to start than it saves
+MIN_PARALLEL_FILES = 8
+
+def map_files_in_parallel(func, files):
+    """
+    Return [func(f) for f in files], in order, spreading the calls over all cores.
+
+    func must be picklable (a module-level function, a partial of one or a
+    method of a picklable object). Small batches run in this process.
+    """
+    if len(files) < MIN_PARALLEL_FILES:
+        return [func(f) for f in files]
+
+    # A few chunks per core: few enough to amortise the pickling, enough to
+    # keep every core busy when file sizes vary
+    chunksize = max(1, len(files) // (4 * (os.cpu_count() or 1)))
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, files, chunksize=chunksize))
+
+def decode_key(raw: bytes) -> str:
+    """Decode a key field; keys are almost always ASCII, so try strict UTF-8 first."""
+    try:
+        return raw.decode()
+    except UnicodeDecodeError:
+        return raw.decode('utf-8', errors='replace')
+
+def iter_keys_bytes(lines):
+    """Yield (key, line_num, raw_line) for every keyed line of a CSV file.
+
+    Only the first field is decoded; the rest of the row stays raw bytes.
+    """
+    for line_num, line in enumerate(lines, 1):
+        # Blank lines and '#' comments are rejected by their first byte
+        if not line or line[0] == 0x23:
+            continue
+        head, sep, _ = line.partition(b';')
+        if not sep:
+            continue
+        key = decode_key(head).strip()
+        if key and not key.startswith('#'):
+            yield sys.intern(key), line_num, line
+
+def replace_file(file_path: Path, data: bytes) -> None:
+    """
+    Write data to a temporary file next to file_path and move it over file_path.
+
+    The original is never truncated, so an interrupted run leaves either the
+    old or the new contents; the temporary file is removed if anything fails.
+    """
+    tmp = tempfile.NamedTemporaryFile('wb', dir=file_path.parent, delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        shutil.copymode(file_path, tmp.name)
+        os.replace(tmp.name, file_path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
@@ -0,0 +1,25 @@
+"""
+Helpers shared by the tests.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# The scripts import localisation_utils as a sibling module
+sys.path.insert(0, str(APP_DIR))
+
+
+def load_script(filename):
+    """Import one of the app scripts as a module; hyphenated names work too."""
+    name = filename[:-3]
+    spec = importlib.util.spec_from_file_location(name, APP_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look their defining module up in sys.modules
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
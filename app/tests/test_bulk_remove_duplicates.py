@@ -0,0 +1,63 @@
+"""
+Key matching in bulk_remove_duplicates.bulk_remove_keys.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import load_script
+
+bulk_remove_duplicates = load_script('bulk_remove_duplicates.py')
+
+COMMENT = b' removed - overridden by higher priority file'
+
+
+class BulkRemoveKeysTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv_path = Path(tmp.name) / 'fixture.csv'
+
+    def remove(self, data, keys):
+        self.csv_path.write_bytes(data)
+        removed = bulk_remove_duplicates.bulk_remove_keys(self.csv_path, set(keys))
+        return removed, self.csv_path.read_bytes()
+
+    def test_ascii_key_is_commented_out(self):
+        removed, data = self.remove(b'key_a;A;;;x\r\n  key_b ;B;;;x\r\nkey_c;C;;;x\r\n',
+                                    ['key_a', 'key_b'])
+        self.assertEqual(removed, 2)
+        self.assertEqual(data, b'# key_a' + COMMENT + b'\r\n# key_b' + COMMENT + b'\r\n'
+                               b'key_c;C;;;x\r\n')
+
+    def test_untouched_lines_keep_their_bytes(self):
+        original = b'key_a;caf\xe9;;;x\r\r\nno separator\n\xff;odd;;;x'
+        removed, data = self.remove(original, ['key_b'])
+        self.assertEqual(removed, 0)
+        self.assertEqual(data, original)
+
+    def test_utf8_key_matches(self):
+        removed, data = self.remove('köy;A;;;x\n'.encode('utf-8'), ['köy'])
+        self.assertEqual(removed, 1)
+        self.assertEqual(data, '# köy'.encode('utf-8') + COMMENT + b'\n')
+
+    def test_replacement_character_matches_invalid_byte(self):
+        # Reports decode cp1252 keys with errors='replace', so 0xE9 arrives as U+FFFD
+        removed, data = self.remove(b'k\xe9y;A;;;x\n', ['k�y'])
+        self.assertEqual(removed, 1)
+        self.assertEqual(data, '# k�y'.encode('utf-8') + COMMENT + b'\n')
+
+    def test_empty_key_never_matches(self):
+        # A trailing comma in the keys file yields an empty key
+        original = b'no separator\n;A;;;x\n'
+        removed, data = self.remove(original, ['', 'key_a'])
+        self.assertEqual(removed, 0)
+        self.assertEqual(data, original)
+
+
+if __name__ == '__main__':
+    unittest.main()
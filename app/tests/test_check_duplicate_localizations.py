@@ -0,0 +1,124 @@
+"""
+Key parsing and the parse cache of check_duplicate_localizations.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from support import load_script
+
+check = load_script('check_duplicate_localizations.py')
+
+
+class ParseCsvKeysTest(unittest.TestCase):
+
+    def parse(self, data):
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as f:
+            f.write(data)
+        self.addCleanup(os.unlink, f.name)
+        return check.parse_csv_keys(f.name)
+
+    def test_single_and_repeated_keys(self):
+        keys = self.parse(b'key_a;A;x\nkey_b;B;x\nkey_a;A2;x\nkey_a;A3;x\n')
+        self.assertEqual(keys, {'key_a': [1, 3, 4], 'key_b': 2})
+
+    def test_blank_comment_and_keyless_lines_are_skipped(self):
+        keys = self.parse(b'\n# key_a;A;x\n  ;B;x\nno separator\n  # key_b;B;x\nkey_c;C;x\n')
+        self.assertEqual(keys, {'key_c': 6})
+
+    def test_crcrlf_line_numbers_match_text_mode(self):
+        # Text-mode reading sees '\r\r\n' as two line breaks
+        keys = self.parse(b'key_a;A;x\r\r\nkey_b;B;x\r\r\n')
+        self.assertEqual(keys, {'key_a': 1, 'key_b': 3})
+
+    def test_keys_are_stripped_and_decoded_as_cp1252(self):
+        keys = self.parse(b' caf\xe9\xa0;A;x\n')
+        self.assertEqual(keys, {'caf\xe9': 1})
+
+    def test_unreadable_file_returns_none(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(check.sys, 'stderr', io.StringIO()):
+            self.assertIsNone(check.parse_csv_keys(os.path.join(tmp, 'missing.csv')))
+
+
+class ScanCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.cache_path = os.path.join(self.dir, check.CACHE_FILENAME)
+        self.write('a.csv', b'key_a;A;x\nshared;A;x\n')
+        self.write('b.csv', b'key_b;B;x\nshared;B;x\n')
+
+    def write(self, name, data):
+        with open(os.path.join(self.dir, name), 'wb') as f:
+            f.write(data)
+
+    def load_cache(self):
+        with open(self.cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    def test_unchanged_files_come_from_the_cache(self):
+        first = check.scan_all(self.dir)[0]
+        with mock.patch.object(check, 'parse_csv_keys') as parse:
+            second = check.scan_all(self.dir)[0]
+        parse.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_stale_entry_is_parsed_again(self):
+        check.scan_all(self.dir)
+        # Same size, different mtime: only the signature tells it changed
+        self.write('b.csv', b'key_c;B;x\nshared;B;x\n')
+        st = os.stat(os.path.join(self.dir, 'b.csv'))
+        os.utime(os.path.join(self.dir, 'b.csv'), ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        file_keys = check.scan_all(self.dir)[0]
+        self.assertIn('key_c', file_keys['b.csv'])
+        self.assertNotIn('key_b', file_keys['b.csv'])
+        self.assertIn('key_c', self.load_cache()['b.csv'][2])
+
+    def test_corrupt_cache_is_ignored(self):
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'not a pickle')
+        file_keys = check.scan_all(self.dir)[0]
+        self.assertIn('key_a', file_keys['a.csv'])
+        self.assertEqual(set(self.load_cache()), {'a.csv', 'b.csv'})
+
+    def test_malformed_entries_are_parsed_again(self):
+        check.scan_all(self.dir)
+        cache = self.load_cache()
+        cache['a.csv'] = 'junk'
+        cache['b.csv'] = cache['b.csv'][:2] + (['not', 'a', 'dict'],)
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump(cache, f)
+
+        file_keys = check.scan_all(self.dir)[0]
+        self.assertIn('key_a', file_keys['a.csv'])
+        self.assertIn('key_b', file_keys['b.csv'])
+
+    def test_failed_parse_is_not_cached(self):
+        parse = check.parse_csv_keys
+
+        def fail_on_b(filepath):
+            return None if filepath.endswith('b.csv') else parse(filepath)
+
+        with mock.patch.object(check, 'parse_csv_keys', side_effect=fail_on_b):
+            file_keys = check.scan_all(self.dir)[0]
+        self.assertEqual(file_keys['b.csv'], {})
+        self.assertNotIn('b.csv', self.load_cache())
+
+        # The next run tries the file again
+        file_keys = check.scan_all(self.dir)[0]
+        self.assertIn('key_b', file_keys['b.csv'])
+        self.assertIn('b.csv', self.load_cache())
+
+
+if __name__ == '__main__':
+    unittest.main()
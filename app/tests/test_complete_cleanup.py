@@ -0,0 +1,59 @@
+"""
+Dead-key removal in complete_cleanup.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from support import load_script
+
+complete_cleanup = load_script('complete_cleanup.py')
+
+COMMENT = b' removed - overridden by higher priority file'
+
+
+class CompleteCleanupTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        # zz_top.csv loads last, so its keys win
+        (self.dir / 'zz_top.csv').write_bytes(b'key_a;Top;x\r\nkey_b;Top;x\r\n')
+        (self.dir / 'aa_low.csv').write_bytes(b'key_a;Low;x\r\nkey_c;Low;x\r\nkey_b;Low;x\r\n')
+
+    def test_overridden_keys_are_commented_out(self):
+        files, file_keys = complete_cleanup.load_all_keys(self.dir)
+        self.assertEqual([f.name for f in files], ['zz_top.csv', 'aa_low.csv'])
+        dead_keys = complete_cleanup.find_all_dead_keys(files, file_keys)
+        self.assertEqual(dead_keys, {'aa_low.csv': {'key_a', 'key_b'}})
+
+        low = self.dir / 'aa_low.csv'
+        self.assertEqual(complete_cleanup.remove_keys_from_file(low, dead_keys['aa_low.csv']), 2)
+        self.assertEqual(low.read_bytes(), b'# key_a' + COMMENT + b'\r\nkey_c;Low;x\r\n'
+                                           b'# key_b' + COMMENT + b'\r\n')
+
+    def test_nothing_to_remove_leaves_file_alone(self):
+        low = self.dir / 'aa_low.csv'
+        original = low.read_bytes()
+        self.assertEqual(complete_cleanup.remove_keys_from_file(low, {'key_z'}), 0)
+        self.assertEqual(low.read_bytes(), original)
+        self.assertEqual(sorted(os.listdir(self.dir)), ['aa_low.csv', 'zz_top.csv'])
+
+    def test_failed_rewrite_leaves_no_temporary_file(self):
+        low = self.dir / 'aa_low.csv'
+        original = low.read_bytes()
+        with mock.patch.object(complete_cleanup.os, 'replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                complete_cleanup.remove_keys_from_file(low, {'key_a'})
+        self.assertEqual(low.read_bytes(), original)
+        self.assertEqual(sorted(os.listdir(self.dir)), ['aa_low.csv', 'zz_top.csv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
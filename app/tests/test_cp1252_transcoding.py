@@ -0,0 +1,48 @@
+"""
+UTF-8 files holding bytes Windows-1252 leaves undefined must still be
+transcoded to cp1252 by the column fixers.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import load_script
+
+# "Á" is C3 81 in UTF-8, and 0x81 has no Windows-1252 mapping
+FIXTURE = 'key_a;Álvaro;;;x\r\nkey_b;café;;;;;;;;;;;;x;;;;;\r\n'.encode('utf-8')
+
+
+class Cp1252TranscodingTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv_path = Path(tmp.name) / 'fixture.csv'
+        self.csv_path.write_bytes(FIXTURE)
+
+    def assert_cp1252(self, data):
+        self.assertIn(b'\xc1lvaro', data)
+        self.assertIn(b'caf\xe9', data)
+        self.assertNotIn(b'\xc3', data)
+
+    def test_fix_column_count(self):
+        module = load_script('fix-column-count.py')
+        success, _ = module.fix_file_column_count(self.csv_path, no_backup=True)
+        self.assertTrue(success)
+        self.assert_cp1252(self.csv_path.read_bytes())
+
+    def test_fix_csv_structure(self):
+        module = load_script('fix-csv-structure.py')
+        self.assertTrue(module.fix_csv_file(self.csv_path, no_backup=True))
+        self.assert_cp1252(self.csv_path.read_bytes())
+
+    def test_invalid_utf8_is_kept(self):
+        module = load_script('fix-csv-structure.py')
+        self.assertEqual(module._utf8_to_cp1252(b'\x81\xff'), b'\x81\xff')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+The run cache, row fixing and backups of fix-localisation.py.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import load_script
+
+fix_localisation = load_script('fix-localisation.py')
+
+ROW = b'key_a;Hello;;;;;;;;;;;;x'
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.cache_path = self.dir / fix_localisation.CACHE_FILENAME
+
+    def run_fixer(self):
+        fixer = fix_localisation.LocalisationFixerV2(self.dir, json_output=True)
+        fixer.run()
+        return fixer.result
+
+    def test_round_trip(self):
+        cache = {'a.csv': (1700000000123456789, 42), 'b.csv': (5, 0)}
+        fix_localisation._save_cache(self.cache_path, cache)
+        self.assertEqual(fix_localisation._load_cache(self.cache_path), cache)
+        self.assertEqual(os.listdir(self.dir), [fix_localisation.CACHE_FILENAME])
+
+    def test_missing_or_corrupt_cache_is_empty(self):
+        self.assertEqual(fix_localisation._load_cache(self.cache_path), {})
+        self.cache_path.write_text('{not json', encoding='utf-8')
+        self.assertEqual(fix_localisation._load_cache(self.cache_path), {})
+
+    def test_clean_files_are_skipped_and_cache_left_alone(self):
+        (self.dir / 'a.csv').write_bytes(ROW + b'\r\r\n' + ROW + b'\r\r\n')
+        self.assertEqual(self.run_fixer().files_skipped, 0)
+        cache_stat = self.cache_path.stat()
+
+        result = self.run_fixer()
+        self.assertEqual(result.files_skipped, 1)
+        self.assertEqual(self.cache_path.stat().st_mtime_ns, cache_stat.st_mtime_ns)
+
+    def test_uppercase_extension_is_fixed(self):
+        # The first row sets the column count; the second is one short
+        (self.dir / 'A.CSV').write_bytes(ROW + b'\r\r\nkey_b;Hi\r\r\n')
+        self.assertEqual(self.run_fixer().files_fixed, 1)
+
+
+class FixLineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fixer = fix_localisation.LocalisationFixerV2(Path('.'))
+
+    def test_correct_row_is_returned_unchanged(self):
+        self.assertEqual(self.fixer.fix_line(ROW + b'\r\r\n', 14), (ROW, False, False))
+
+    def test_blank_and_comment_rows_are_kept(self):
+        self.assertEqual(self.fixer.fix_line(b'  \r\n', 14), (b'  ', False, False))
+        self.assertEqual(self.fixer.fix_line(b'# note;x', 14), (b'# note;x', False, False))
+
+    def test_padded_end_marker_is_kept(self):
+        row = b'key_a;Hello;;;;;;;;;;;; x '
+        self.assertEqual(self.fixer.fix_line(row, 14), (row, False, False))
+
+    def test_wrong_end_marker_is_replaced(self):
+        self.assertEqual(self.fixer.fix_line(b'key_a;Hello;;;;;;;;;;;;y', 14), (ROW, True, False))
+
+    def test_short_row_is_padded(self):
+        self.assertEqual(self.fixer.fix_line(b'key_a;Hello;x', 14), (ROW, False, True))
+
+    def test_long_row_is_truncated(self):
+        self.assertEqual(self.fixer.fix_line(ROW + b';;;;;', 14), (ROW, False, True))
+
+
+class BackupTest(unittest.TestCase):
+
+    def test_backup_survives_in_place_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / 'a.csv'
+            csv_path.write_bytes(b'old')
+            fix_localisation.LocalisationFixerV2(Path(tmp)).create_backup(csv_path)
+            # Other scripts in the toolkit truncate and rewrite files in place
+            csv_path.write_bytes(b'new')
+            self.assertEqual((Path(tmp) / 'a.csv.bak').read_bytes(), b'old')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Backups taken by the column and line-ending fixers must be real copies.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import load_script
+
+# Needs both a column fix and a line-ending fix
+ORIGINAL = b'key_a;Hello;x\nkey_b;World;x\n'
+
+
+class FixerBackupTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv_path = Path(tmp.name) / 'a.csv'
+        self.csv_path.write_bytes(ORIGINAL)
+        self.backup_path = Path(tmp.name) / 'a.csv.bak'
+
+    def assert_backup_survives(self):
+        self.assertNotEqual(self.csv_path.read_bytes(), ORIGINAL)
+        # Other scripts in the toolkit truncate and rewrite files in place
+        self.csv_path.write_bytes(b'rewritten in place')
+        self.assertEqual(self.backup_path.read_bytes(), ORIGINAL)
+
+    def test_fix_column_count(self):
+        module = load_script('fix-column-count.py')
+        success, _ = module.fix_file_column_count(self.csv_path, backup_suffix='.bak')
+        self.assertTrue(success)
+        self.assert_backup_survives()
+
+    def test_fix_csv_structure(self):
+        module = load_script('fix-csv-structure.py')
+        self.assertTrue(module.fix_csv_file(self.csv_path, backup_suffix='.bak'))
+        self.assert_backup_survives()
+
+    def test_fix_line_endings(self):
+        module = load_script('fix-line-endings.py')
+        success, _ = module.fix_file_line_endings(self.csv_path, backup_suffix='.bak')
+        self.assertTrue(success)
+        self.assert_backup_survives()
+
+
+if __name__ == '__main__':
+    unittest.main()
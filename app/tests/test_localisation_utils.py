@@ -0,0 +1,60 @@
+"""
+Helpers shared by the localisation scripts.
+
+Run from the app directory: python -m unittest discover tests
+"""
+
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import load_script
+
+localisation_utils = load_script('localisation_utils.py')
+
+
+class MapFilesInParallelTest(unittest.TestCase):
+
+    def test_small_batch_keeps_order(self):
+        files = ['a' * n for n in range(3)]
+        self.assertEqual(localisation_utils.map_files_in_parallel(len, files), [0, 1, 2])
+
+    def test_large_batch_keeps_order(self):
+        files = ['a' * n for n in range(4 * localisation_utils.MIN_PARALLEL_FILES)]
+        self.assertEqual(localisation_utils.map_files_in_parallel(len, files),
+                         list(range(len(files))))
+
+
+class ReplaceFileTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.path = self.dir / 'a.csv'
+        self.path.write_bytes(b'old')
+
+    def test_contents_and_mode(self):
+        os.chmod(self.path, 0o640)
+        localisation_utils.replace_file(self.path, b'new')
+        self.assertEqual(self.path.read_bytes(), b'new')
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o640)
+        self.assertEqual(os.listdir(self.dir), ['a.csv'])
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        with self.assertRaises(TypeError):
+            localisation_utils.replace_file(self.path, 'not bytes')
+        self.assertEqual(self.path.read_bytes(), b'old')
+        self.assertEqual(os.listdir(self.dir), ['a.csv'])
+
+    def test_failed_replace_leaves_no_temporary_file(self):
+        # copymode needs the original, so a vanished target fails after the write
+        with self.assertRaises(FileNotFoundError):
+            localisation_utils.replace_file(self.dir / 'missing.csv', b'new')
+        self.assertEqual(os.listdir(self.dir), ['a.csv'])
+
+
+if __name__ == '__main__':
+    unittest.main()